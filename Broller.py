@@ -1,23 +1,43 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import bisect
+import json
+import math
+import os
 import random
 import re
+import time
+from collections import deque
 
 
-# --- 1. CONNECT TO RESOLVE ---
-try:
-    resolve = app.GetResolve()
-    project_manager = resolve.GetProjectManager()
-    project = project_manager.GetCurrentProject()
-    media_pool = project.GetMediaPool()
-    
-    timeline_fps = project.GetSetting("timelineFrameRate")
-    FPS = float(timeline_fps) if timeline_fps else 24.0
-    
-except NameError:
-    print("Error: 'app' not found. Please run this script INSIDE DaVinci Resolve.")
-    resolve, project, media_pool = None, None, None
-    FPS = 24.0
+STARTUP_TIME = time.perf_counter()
+ROW_CHUNK = 40  # Clip rows built per batch as the list scrolls
+SCAN_STEP_SEC = 0.03  # Time slice per background scan step, keeps the window responsive
+
+
+# --- 1. CONNECT TO RESOLVE (lazily, on first use) ---
+resolve, project, media_pool = None, None, None
+FPS = 24.0
+
+
+def connect_resolve():
+    """Connect to the running Resolve instance. Returns True when connected."""
+    global resolve, project, media_pool, FPS
+    if project:
+        return True
+    try:
+        resolve = app.GetResolve()
+        project_manager = resolve.GetProjectManager()
+        project = project_manager.GetCurrentProject()
+        media_pool = project.GetMediaPool()
+
+        timeline_fps = project.GetSetting("timelineFrameRate")
+        FPS = float(timeline_fps) if timeline_fps else 24.0
+        return True
+    except NameError:
+        print("Error: 'app' not found. Please run this script INSIDE DaVinci Resolve.")
+        resolve, project, media_pool = None, None, None
+        return False
 
 
 # --- HELPER: Timecode to Frames ---
@@ -31,6 +51,1129 @@ def parse_timecode_to_frames(timecode_str):
         return 0
 
 
+# --- HELPER: Resolution String to (width, height) ---
+def parse_resolution(resolution_str):
+    match = re.match(r'\s*(\d+)\s*[xX×]\s*(\d+)', resolution_str or "")
+    if not match:
+        return 0, 0
+    return int(match.group(1)), int(match.group(2))
+
+
+def tokenize(text):
+    return re.findall(r'[a-z0-9]+', str(text).lower())
+
+
+def normalize_phrase(text):
+    return " ".join(str(text).lower().split())
+
+
+# --- HELPER: Media Pool Walk ---
+def iter_media_pool(folder, bin_path):
+    """Yield (clip, folder, props, bin_path) for every usable clip, depth first"""
+    for clip in folder.GetClipList():
+        # One call returns every property (type, duration, fps, keywords...)
+        props = clip.GetClipProperty() or {}
+        c_type = props.get("Type", "")
+        if "Timeline" in c_type: continue
+        if "Video" in c_type or "Image" in c_type or "Stills" in c_type:
+            yield clip, folder, props, bin_path
+    for sub in folder.GetSubFolderList():
+        yield from iter_media_pool(sub, f"{bin_path}/{sub.GetName()}")
+
+
+# --- RENDER COST MODEL ---
+# Codec class by name markers, checked in order. Intra-only variants of long-GOP formats
+# (AVC-Intra, XAVC Intra, All-I) are matched before the long-GOP markers.
+CODEC_CLASSES = (
+    ("raw", ("raw", "r3d", "arri")),
+    ("intra", ("intra", "all-i", "all i")),
+    ("hevc", ("265", "hevc")),
+    ("avc", ("264", "avc")),
+)
+# Decode cost relative to intra-frame codecs (ProRes, DNxHR...) at the same resolution
+CODEC_COSTS = {"raw": 3.0, "hevc": 2.5, "avc": 1.5, "intra": 1.0}
+HEAVY_CODECS = ("raw", "hevc")  # Heavy at any resolution unless proxied
+HEAVY_COST = 5.0  # Anything else this costly is heavy too, e.g. UHD H.264, 8K intra
+PROXY_COST = 0.5  # Proxy or optimized media plays back at about this cost
+
+
+def codec_class(codec):
+    """Codec class name for a "Video Codec" property ("intra" when nothing matches)"""
+    codec = codec.lower()
+    return next((name for name, markers in CODEC_CLASSES if any(m in codec for m in markers)), "intra")
+
+
+def render_cost(codec, width, height, is_still, has_proxy):
+    """Relative playback/render cost of a clip (1.0 ~ HD intra-frame)"""
+    if is_still:
+        return 0.1
+    if has_proxy:
+        return PROXY_COST
+    pixels = (width * height) / (1920 * 1080) if width and height else 1.0
+    return round(pixels * CODEC_COSTS[codec_class(codec)], 2)
+
+
+def is_heavy_media(codec, cost, is_still, has_proxy):
+    """True for clips that strain playback: RAW or HEVC at any size, or anything costing HEAVY_COST"""
+    if is_still or has_proxy:
+        return False
+    return codec_class(codec) in HEAVY_CODECS or cost >= HEAVY_COST
+
+
+def has_proxy_media(props):
+    """True if the clip has proxy or optimized media to play back instead of the original"""
+    for key in ("Proxy", "Optimized Media"):
+        if str(props.get(key, "")).strip().lower() not in ("", "none", "n/a"):
+            return True
+    return bool(props.get("Proxy Media Path"))
+
+
+# --- HELPER: Clip Properties to Cacheable Record ---
+def make_clip_record(clip, props, bin_path):
+    """Describe a clip with plain values (also used as its search index metadata)"""
+    c_type = props.get("Type", "")
+    is_still = "Still" in c_type or "Image" in c_type
+
+
+    # Parse duration
+    if is_still:
+        duration_sec = float('inf')
+    else:
+        dur = props.get("Duration")
+        duration_sec = parse_timecode_to_frames(dur) / FPS if dur else 0
+
+
+    width, height = parse_resolution(props.get("Resolution"))
+    try:
+        clip_fps = float(props.get("FPS") or 0)
+    except ValueError:
+        clip_fps = 0.0
+    codec = props.get("Video Codec", "")
+    has_proxy = has_proxy_media(props)
+    cost = render_cost(codec, width, height, is_still, has_proxy)
+
+
+    return {
+        'name': clip.GetName(),
+        'uid': clip.GetUniqueId(),
+        'bin': bin_path,
+        'is_still': is_still,
+        'color': props.get("Clip Color", ""),
+        'keywords': props.get("Keywords", ""),
+        'meta': "\n".join(str(props.get(k, "")) for k in
+                          ("Comments", "Description", "Scene", "Shot", "Take", "Angle")),
+        'duration': duration_sec,
+        'fps': clip_fps,
+        'width': width,
+        'height': height,
+        'codec': codec,
+        'has_proxy': has_proxy,
+        'cost': cost,
+        'heavy': is_heavy_media(codec, cost, is_still, has_proxy),
+    }
+
+
+# --- CLIP SEARCH INDEX ---
+class ClipIndex:
+    """In-memory index over scanned clip metadata.
+
+    Query terms are ANDed together:
+        drone               token prefix in any text field
+        bin:day             token prefix in one field (name, bin, color, keywords, codec, meta)
+        bin:"Day 2"         quoted: exact field value, bin path component or keyword
+        color:orange|blue   any of several values ("Day 2|Day 3" when quoted)
+        duration>30         numeric comparison on duration, fps, width, height, cost
+        -interview          exclude matches
+    """
+    TEXT_FIELDS = ("name", "bin", "color", "keywords", "codec", "meta")
+    PHRASE_SEPARATORS = {"bin": "/", "keywords": ",", "meta": "\n"}  # Parts that match exactly too
+    NUMERIC_FIELDS = ("duration", "fps", "width", "height", "cost")
+    ALIASES = {"dur": "duration", "folder": "bin", "kw": "keywords", "res": "height",
+               "clipcolor": "color", "w": "width", "h": "height"}
+    TERM_RE = re.compile(r'^(-?)(?:([a-z]+)(>=|<=|>|<|=|:))?(.*)$', re.IGNORECASE)
+    WORD_RE = re.compile(r'''(?:[^\s"']|"[^"]*"|'[^']*')+''')
+    QUOTED_RE = re.compile(r""""([^"]*)"|'([^']*)'""")
+
+
+    def __init__(self):
+        self.names = set()
+        self.postings = {}  # "field:token" -> set of clip names ("*:token" for any field)
+        self.vocab = []     # sorted postings keys, for prefix lookups
+        self.phrases = {}   # "field=normalized value" -> set of clip names ("*=value" for any field)
+        self.numeric = {field: [] for field in self.NUMERIC_FIELDS}
+        self.numeric_values = {}
+        self.numeric_names = {}
+
+
+    def add(self, clip_name, meta):
+        """Index one clip. `meta` holds text fields and numeric fields by name."""
+        self.names.add(clip_name)
+        for field in self.TEXT_FIELDS:
+            value = str(meta.get(field) or "")
+            for token in tokenize(value):
+                for key in (f"{field}:{token}", f"*:{token}"):
+                    self.postings.setdefault(key, set()).add(clip_name)
+            parts = {value}
+            if field in self.PHRASE_SEPARATORS:
+                parts.update(value.split(self.PHRASE_SEPARATORS[field]))
+            for part in parts:
+                phrase = normalize_phrase(part)
+                if phrase:
+                    for key in (f"{field}={phrase}", f"*={phrase}"):
+                        self.phrases.setdefault(key, set()).add(clip_name)
+        for field in self.NUMERIC_FIELDS:
+            value = meta.get(field)
+            # Stills have no duration (stored as inf), so they never match duration comparisons
+            if value is not None and math.isfinite(value):
+                self.numeric[field].append((value, clip_name))
+
+
+    def finalize(self):
+        """Sort lookup structures once all clips are added"""
+        self.vocab = sorted(self.postings)
+        for field, pairs in self.numeric.items():
+            pairs.sort(key=lambda p: p[0])
+            self.numeric_values[field] = [p[0] for p in pairs]
+            self.numeric_names[field] = [p[1] for p in pairs]
+
+
+    def _prefix_matches(self, key):
+        found = set()
+        i = bisect.bisect_left(self.vocab, key)
+        while i < len(self.vocab) and self.vocab[i].startswith(key):
+            found |= self.postings[self.vocab[i]]
+            i += 1
+        return found
+
+
+    def _match_text(self, field, value, exact=False):
+        matches = set()
+        for option in value.split("|"):
+            if exact:
+                matches |= self.phrases.get(f"{field}={normalize_phrase(option)}", set())
+                continue
+            tokens = tokenize(option)
+            if not tokens:
+                continue
+            option_matches = None
+            for token in tokens:
+                hits = self._prefix_matches(f"{field}:{token}")
+                option_matches = hits if option_matches is None else option_matches & hits
+            matches |= option_matches
+        return matches
+
+
+    def _match_numeric(self, field, op, value):
+        try:
+            target = float(value)
+        except ValueError:
+            raise ValueError(f"'{value}' is not a number for {field}")
+        values = self.numeric_values[field]
+        names = self.numeric_names[field]
+        if op == ">":
+            return set(names[bisect.bisect_right(values, target):])
+        if op == ">=":
+            return set(names[bisect.bisect_left(values, target):])
+        if op == "<":
+            return set(names[:bisect.bisect_left(values, target)])
+        if op == "<=":
+            return set(names[:bisect.bisect_right(values, target)])
+        # "=" or ":" - allow for rounding in values like 23.976
+        lo = bisect.bisect_left(values, target - 0.01)
+        hi = bisect.bisect_right(values, target + 0.01)
+        return set(names[lo:hi])
+
+
+    def query(self, expression):
+        """Return the set of clip names matching `expression`. Raises ValueError on bad syntax."""
+        # Split on whitespace outside quotes, keeping the quotes so quoted values can be told apart
+        terms = self.WORD_RE.findall(expression)
+        if self.WORD_RE.sub("", expression).strip():
+            raise ValueError("Could not parse query: No closing quotation")
+        if not terms:
+            raise ValueError("Query is empty.")
+
+        result = set(self.names)
+        for term in terms:
+            negate, field, op, value = self.TERM_RE.match(term).groups()
+            quoted = '"' in value or "'" in value
+            if quoted:
+                value = self.QUOTED_RE.sub(lambda m: m.group(1) or m.group(2) or "", value)
+            if not value.strip():
+                raise ValueError(f"Missing value in '{term}'")
+            field = self.ALIASES.get((field or "").lower(), (field or "").lower())
+
+            if field in self.NUMERIC_FIELDS:
+                matches = self._match_numeric(field, op, value)
+            elif op in (None, ":", "="):
+                if field and field not in self.TEXT_FIELDS:
+                    raise ValueError(f"Unknown field '{field}'")
+                matches = self._match_text(field or "*", value, exact=quoted)
+            else:
+                raise ValueError(f"Cannot compare text field '{field}' with '{op}'")
+
+            if negate:
+                result -= matches
+            else:
+                result &= matches
+        return result
+
+
+# --- PROJECT DATA (presets, scan cache) ---
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".broller")
+LAST_SESSION = "Last Session"
+
+
+def project_data_path(project_name, kind):
+    """JSON file for one project, in a subdirectory per kind so names from different kinds never collide"""
+    safe_name = re.sub(r'[^\w.-]+', '_', project_name) or "untitled"
+    return os.path.join(DATA_DIR, kind, f"{safe_name}.json")
+
+
+def write_json(path, data):
+    """Write compact JSON atomically so a crash never leaves a half-written file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+class PresetStore:
+    """Selection presets for one project, stored as compact JSON keyed by clip unique ID"""
+    def __init__(self, project_name):
+        self.path = project_data_path(project_name, "presets")
+        self.presets = {}
+
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.presets = json.load(f)
+        except (OSError, ValueError):
+            self.presets = {}
+        return self
+
+
+    def names(self):
+        return sorted(self.presets)
+
+
+    def get(self, name):
+        return self.presets.get(name)
+
+
+    def save(self, name, preset):
+        self.presets[name] = preset
+        self._write()
+
+
+    def delete(self, name):
+        if self.presets.pop(name, None) is not None:
+            self._write()
+
+
+    def _write(self):
+        write_json(self.path, self.presets)
+
+
+class ScanCache:
+    """Clip records from the last Media Pool scan, shown at startup while a fresh scan runs"""
+    VERSION = 4
+
+
+    def __init__(self, project_name):
+        self.path = project_data_path(project_name, "scans")
+
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return []
+        # Durations are stored in seconds at the timeline FPS, so a changed FPS invalidates them
+        if data.get('version') != self.VERSION or data.get('fps') != FPS:
+            return []
+        return data.get('clips', [])
+
+
+    def save(self, records):
+        write_json(self.path, {'version': self.VERSION, 'fps': FPS, 'clips': records})
+
+
+def clip_keys(records):
+    """Unique model key per record: the clip name, with the bin added where names repeat"""
+    counts = {}
+    for record in records:
+        counts[record['name']] = counts.get(record['name'], 0) + 1
+    keys, used = [], set()
+    for record in records:
+        key = record['name'] if counts[record['name']] == 1 else f"{record['name']} [{record['bin']}]"
+        base, n = key, 2
+        while key in used:  # Same name twice in the same bin
+            key = f"{base} #{n}"
+            n += 1
+        used.add(key)
+        keys.append(key)
+    return keys
+
+
+def fit_clip_range(start, end, duration):
+    """Clamp a range to the clip; an empty or inverted range becomes the full clip"""
+    start, end = max(0.0, start), min(end, duration)
+    if start >= end:
+        return 0.0, duration
+    return start, end
+
+
+def make_clip_config(record, clip=None, folder=None):
+    """Per-clip model entry (widgets are added when its row is built)"""
+    return {
+        'uid': record['uid'],
+        'clip': clip,
+        'folder': folder,
+        'total_duration': record['duration'],
+        'range_start': 0.0,
+        'range_end': 999999.0 if record['is_still'] else record['duration'],
+        'expanded': False,
+        'rendered': False,
+        'is_still': record['is_still'],
+        'cost': record['cost'],
+        'heavy': record['heavy'],
+    }
+
+
+def merge_clip_records(clip_configs, selected_clips, records, live=None):
+    """Bring the clip model up to date with scan records, keeping selection and ranges by unique ID.
+
+    `live` maps uid -> (clip, folder) once the Media Pool has actually been scanned;
+    records loaded from the cache have no clip objects until then. If the same clips
+    are listed in the same order with the same rows, `clip_configs` is refreshed in
+    place and None is returned. Otherwise returns new (clip_configs, clip_uids,
+    selected_clips), ordered like `records`.
+    """
+    live = live or {}
+    keys = clip_keys(records)
+    layout = [(r['uid'], key, r['duration'], r['is_still']) for r, key in zip(records, keys)]
+    if layout and layout == [(cfg['uid'], name, cfg['total_duration'], cfg['is_still'])
+                             for name, cfg in clip_configs.items()]:
+        for record, cfg in zip(records, clip_configs.values()):
+            cfg['clip'], cfg['folder'] = live.get(cfg['uid'], (None, None))
+            cfg['cost'], cfg['heavy'] = record['cost'], record['heavy']
+        return None
+
+
+    previous = {cfg['uid']: cfg for cfg in clip_configs.values()}
+    selected_uids = {clip_configs[name]['uid'] for name in selected_clips}
+    new_configs, clip_uids = {}, {}
+    for key, record in zip(keys, records):
+        clip, folder = live.get(record['uid'], (None, None))
+        cfg = make_clip_config(record, clip, folder)
+        old = previous.get(record['uid'])
+        # Keep a custom range, fitted to the clip's current duration
+        if old and not cfg['is_still'] and (old['range_start'], old['range_end']) != (0.0, old['total_duration']):
+            cfg['range_start'], cfg['range_end'] = fit_clip_range(old['range_start'], old['range_end'],
+                                                                  cfg['total_duration'])
+        clip_uids[record['uid']] = key
+        new_configs[key] = cfg
+    selected = {name for name, cfg in new_configs.items() if cfg['uid'] in selected_uids}
+    return new_configs, clip_uids, selected
+
+
+# --- RENDER COST POLICY ---
+class RenderCostPolicy:
+    """Clip picker that prefers cheap-to-play clips and caps heavy slices per window.
+
+    Weights come from the per-clip cost and heavy flag computed at scan time, so
+    picking makes no API calls. At most `max_heavy` heavy slices start within
+    any `window_frames` stretch of the timeline, as long as lighter clips remain.
+    The weighted pools are cached; call remove() when a clip leaves the pool.
+    """
+    def __init__(self, clip_configs, max_heavy, window_frames):
+        self.clip_configs = clip_configs
+        self.max_heavy = max_heavy
+        self.window_frames = window_frames
+        self.heavy_starts = deque()  # Record frames of recent heavy slices
+        self._pools = {}  # light only -> (names, cumulative weights)
+
+
+    def is_heavy(self, clip_name):
+        return self.clip_configs[clip_name]['heavy']
+
+
+    def weight(self, clip_name):
+        """Pick weight: proxies (2.0) over HD intra (1.0) over costlier clips; stills stay neutral"""
+        cfg = self.clip_configs[clip_name]
+        if cfg['is_still']:
+            return 1.0
+        return 1.0 / max(cfg['cost'], PROXY_COST)
+
+
+    def remove(self, clip_name):
+        """Forget cached pools once `clip_name` is no longer in the caller's clip list"""
+        self._pools.clear()
+
+
+    def _pool(self, valid_clips, light_only):
+        if light_only not in self._pools:
+            names = [n for n in valid_clips if not (light_only and self.is_heavy(n))]
+            cum_weights, total = [], 0.0
+            for name in names:
+                total += self.weight(name)
+                cum_weights.append(total)
+            self._pools[light_only] = (names, cum_weights)
+        return self._pools[light_only]
+
+
+    def choose(self, valid_clips, record_pos):
+        while self.heavy_starts and self.heavy_starts[0] <= record_pos - self.window_frames:
+            self.heavy_starts.popleft()
+
+
+        names, cum_weights = self._pool(valid_clips, len(self.heavy_starts) >= self.max_heavy)
+        if not names:
+            names, cum_weights = self._pool(valid_clips, False)  # Only heavy clips left
+        return random.choices(names, cum_weights=cum_weights)[0]
+
+
+    def placed(self, clip_name, record_pos):
+        if self.is_heavy(clip_name):
+            self.heavy_starts.append(record_pos)
+
+
+# --- SLICE PACING ---
+PACING_MODES = ("Uniform", "Normal", "Log-normal", "Speed Up", "Slow Down")
+
+
+class PacingEngine:
+    """Plans slice lengths (in frames) that add up exactly to the fill length.
+
+    Lengths are drawn in bulk from the chosen distribution and kept within
+    [min_f, max_f]. Each draw is nudged, if needed, so the frames left after it
+    can still be split into in-bounds slices, so the fill never ends on a sliver.
+    If the total itself cannot be split that way, the last slice runs over
+    max_f instead. "Speed Up" / "Slow Down" move the typical length from max
+    to min (or min to max) along the fill. Bounds must satisfy 0 < min_f <= max_f.
+    """
+    CURVE_JITTER = 0.5  # Spread around the pacing curve, as a fraction of (max - min)
+
+
+    def __init__(self, mode, min_f, max_f):
+        if not 0 < min_f <= max_f:
+            raise ValueError(f"Slice bounds must satisfy 0 < min <= max (got {min_f}, {max_f} frames)")
+        self.mode = mode if mode in PACING_MODES else "Uniform"
+        self.min_f = min_f
+        self.max_f = max_f
+
+
+    def _samples(self, count):
+        """Draw `count` lengths as fractions of the [min_f, max_f] span (may fall outside 0..1)"""
+        if self.mode == "Normal":
+            return [random.gauss(0.5, 1 / 6) for _ in range(count)]  # +/- 3 sigma spans the bounds
+        if self.mode == "Log-normal" and self.max_f > self.min_f:
+            lo, span = self.min_f, self.max_f - self.min_f
+            mu = math.log(math.sqrt(self.min_f * self.max_f))
+            sigma = math.log(self.max_f / self.min_f) / 6
+            return [(random.lognormvariate(mu, sigma) - lo) / span for _ in range(count)]
+        return [random.random() for _ in range(count)]
+
+
+    def _feasible(self, frames):
+        """True if `frames` can be split into slices within [min_f, max_f]"""
+        return frames == 0 or -(-frames // self.max_f) * self.min_f <= frames
+
+
+    def capped(self, longest):
+        """Engine whose slices are at most `longest` frames (this one if that cap is not below max_f,
+        or would fall below min_f)"""
+        if self.min_f <= longest < self.max_f:
+            return PacingEngine(self.mode, self.min_f, int(longest))
+        return self
+
+
+    def fit_shorter(self, usable, remaining):
+        """Longest slice of at most `usable` frames (and at least min_f, if usable allows) that
+        leaves a remainder which can still be filled in bounds, or None if there is none"""
+        lowest = min(self.min_f, usable)
+        for length in range(min(usable, remaining), lowest - 1, -1):
+            if self._feasible(remaining - length):
+                return length
+        return None
+
+
+    def _fit(self, length, remaining):
+        """Nearest length to `length` that leaves a remainder which can still be filled in bounds"""
+        upper = min(self.max_f, remaining)
+        if remaining <= self.min_f:
+            return remaining
+        length = max(self.min_f, min(length, upper))
+        for delta in range(upper - self.min_f + 1):
+            for candidate in (length - delta, length + delta):
+                if self.min_f <= candidate <= upper and self._feasible(remaining - candidate):
+                    return candidate
+        return length
+
+
+    def plan(self, total, done=0, overall=None):
+        """Slice lengths summing to `total` frames.
+
+        `done` and `overall` place this plan along the whole fill, so a re-plan of
+        the tail continues the pacing curve where it left off.
+        """
+        overall = overall or total
+        span = self.max_f - self.min_f
+        curve = self.mode in ("Speed Up", "Slow Down")
+        samples = self._samples(int(total / (self.min_f + span / 2)) + 8)
+
+
+        lengths = []
+        remaining = total
+        i = 0
+        while remaining > 0:
+            if i == len(samples):
+                samples.extend(self._samples(len(samples)))
+            fraction = samples[i]
+            i += 1
+            if curve:
+                t = (done + total - remaining) / overall
+                center = 1 - t if self.mode == "Speed Up" else t
+                fraction = center + (fraction - 0.5) * self.CURVE_JITTER
+            length = self._fit(round(self.min_f + fraction * span), remaining)
+            lengths.append(length)
+            remaining -= length
+
+
+        # Only reachable when `total` cannot be split in bounds: run long rather than end on a sliver
+        if len(lengths) > 1 and lengths[-1] < self.min_f:
+            last = lengths.pop()
+            lengths[-1] += last
+        return lengths
+
+
+# --- TIMELINE OCCUPANCY INDEX ---
+class TimelineIndex:
+    """Occupancy of the video tracks, kept across runs and updated from our own inserts.
+
+    Each track is summarised by its item count and the end of its last item,
+    which costs one GetItemListInTrack and one GetEnd. This relies on Resolve
+    listing track items in timeline order, as GetItemListInTrack does (and the
+    mock timeline mirrors). begin_run() makes the next use of every track
+    re-check that summary, so tracks edited since the last run are summarised
+    again. Full start/end spans are only fetched when a range query reaches
+    before the end of the track, at most once per track per run, so edits
+    that keep the count and last end are still seen by those queries.
+    """
+    def __init__(self, timeline):
+        self.uid = timeline.GetUniqueId()
+        self.tracks = {}  # track index -> {'count', 'end', 'starts', 'ends'}; spans are None until fetched
+        self.begin_run(timeline)
+
+
+    def begin_run(self, timeline):
+        """Start a generation run on (a fresh handle to) the same timeline"""
+        self.timeline = timeline
+        self.start_frame = timeline.GetStartFrame()
+        self.checked = set()  # Tracks compared against the timeline this run
+
+
+    def _track(self, track_idx):
+        track = self.tracks.get(track_idx)
+        if track_idx not in self.checked:
+            items = self.timeline.GetItemListInTrack("video", track_idx) or []
+            end = items[-1].GetEnd() if items else self.start_frame
+            if track is None or (track['count'], track['end']) != (len(items), end):
+                track = {'count': len(items), 'end': end}
+                self.tracks[track_idx] = track
+            track['starts'] = track['ends'] = None  # Spans from an earlier run may be stale
+            self.checked.add(track_idx)
+        return track
+
+
+    def _spans(self, track_idx, track):
+        if track['starts'] is None:
+            items = self.timeline.GetItemListInTrack("video", track_idx) or []
+            spans = sorted((item.GetStart(), item.GetEnd()) for item in items)
+            track['starts'], track['ends'] = [s for s, e in spans], [e for s, e in spans]
+            # The full fetch does not depend on item order, so it also corrects the summary
+            track['count'] = len(spans)
+            track['end'] = max(track['ends'], default=self.start_frame)
+        return track['starts'], track['ends']
+
+
+    def add_empty_track(self, track_idx):
+        """Register a track we just created, without querying it"""
+        self.tracks[track_idx] = {'count': 0, 'end': self.start_frame, 'starts': [], 'ends': []}
+        self.checked.add(track_idx)
+
+
+    def add(self, track_idx, start, end):
+        """Record an item we placed on the track"""
+        track = self._track(track_idx)
+        track['count'] += 1
+        track['end'] = max(track['end'], end)
+        if track['starts'] is not None:
+            i = bisect.bisect_right(track['starts'], start)
+            track['starts'].insert(i, start)
+            track['ends'].insert(i, end)
+
+
+    def track_end(self, track_idx):
+        """End frame of the last item on the track (timeline start if empty)"""
+        return self._track(track_idx)['end']
+
+
+    def is_free(self, track_idx, start, end):
+        """True if no item overlaps [start, end)"""
+        track = self._track(track_idx)
+        if not track['count'] or start >= track['end']:
+            return True  # Appending past the last item needs no spans
+        starts, ends = self._spans(track_idx, track)
+        i = bisect.bisect_right(starts, start)
+        if i > 0 and ends[i - 1] > start:
+            return False
+        return i == len(starts) or starts[i] >= end
+
+
+    def gaps(self, track_idx, start, end):
+        """List of empty (gap_start, gap_end) ranges on the track between start and end"""
+        if start >= end:
+            return []
+        track = self._track(track_idx)
+        if not track['count'] or start >= track['end']:
+            return [(start, end)]
+        starts, ends = self._spans(track_idx, track)
+        found = []
+        pos = start
+        # First item that ends after `start` - earlier items cannot affect the range
+        i = bisect.bisect_right(ends, start)
+        while i < len(starts) and starts[i] < end:
+            if starts[i] > pos:
+                found.append((pos, starts[i]))
+            pos = max(pos, ends[i])
+            i += 1
+        if pos < end:
+            found.append((pos, end))
+        return found
+
+
+# --- SLICE PLACEMENT ---
+class SlicePlacer:
+    """Appends planned slices from the selected clips to a track.
+
+    Holds no UI state, so the same loop runs inside Resolve and against a
+    stand-in API (see mock_resolve.py). `clip_configs` is the generator's
+    per-clip model; `log` receives progress messages. After run(),
+    `stop_reason` says why it ended: "complete", "exhausted", "failures",
+    "occupied" or "delete_failed".
+    """
+    MAX_CONSECUTIVE_FAILURES = 5
+    MAX_SEGMENT_ATTEMPTS = 10
+
+
+    def __init__(self, media_pool, timeline, timeline_index, clip_configs, prevent_duplicates=False, log=print,
+                 cost_policy=None):
+        self.media_pool = media_pool
+        self.timeline = timeline
+        self.timeline_index = timeline_index
+        self.clip_configs = clip_configs
+        self.prevent_duplicates = prevent_duplicates
+        self.log = log
+        self.cost_policy = cost_policy  # Optional RenderCostPolicy
+        self.used_segments = {}  # Track used segments for duplicate prevention
+        self.stop_reason = None
+
+
+    def _has_overlap(self, clip_name, new_start, new_end):
+        """Check if [new_start, new_end) overlaps with any used segment of this clip"""
+        if clip_name not in self.used_segments:
+            return False
+
+
+        for seg_start, seg_end in self.used_segments[clip_name]:
+            # Overlap condition: NOT (new is completely before OR completely after existing)
+            if not (new_end <= seg_start or new_start >= seg_end):
+                return True
+
+
+        return False
+
+
+    def _drop_clip(self, valid_clips, clip_name):
+        """Take a clip out of this run's pool"""
+        valid_clips.remove(clip_name)
+        if self.cost_policy:
+            self.cost_policy.remove(clip_name)
+
+
+    def _longest_range(self, valid_clips):
+        """Longest usable range in frames among the clips (unbounded if there is a still)"""
+        longest = 0
+        for name in valid_clips:
+            cfg = self.clip_configs[name]
+            if cfg['is_still']:
+                return float('inf')
+            longest = max(longest, int(cfg['range_end'] * FPS) - int(cfg['range_start'] * FPS))
+        return longest
+
+
+    def run(self, dest_track_idx, current_pos, frames_to_fill, valid_clips, pacer):
+        """Main placement loop with duplicate tracking. Returns (clips_added, frames_filled)."""
+        # Initialize tracking
+        self.used_segments = {}
+        valid_clips = list(valid_clips)
+        filled_so_far = 0
+        clips_added = 0
+        consecutive_failures = 0
+        short_picks = 0  # Clips picked in a row that were too short for the planned slice
+        plan = deque()  # Planned slice lengths for the rest of the fill
+        # No slice can be longer than the longest clip range, so plan within that
+        pacer = pacer.capped(self._longest_range(valid_clips))
+        self.stop_reason = "complete"
+
+
+        try:
+            while filled_so_far < frames_to_fill:
+                if not valid_clips:
+                    self.log("All clips exhausted!")
+                    self.stop_reason = "exhausted"
+                    break
+
+
+                # Re-plan the tail when empty (start, or after a clip could not supply its planned length)
+                if not plan:
+                    plan = deque(pacer.plan(frames_to_fill - filled_so_far, filled_so_far, frames_to_fill))
+
+
+                # 1. Select random clip from pool
+                record_pos = current_pos + filled_so_far  # Start pos + what we've added so far
+                if self.cost_policy:
+                    clip_name = self.cost_policy.choose(valid_clips, record_pos)
+                else:
+                    clip_name = random.choice(valid_clips)
+                cfg = self.clip_configs[clip_name]
+                clip, folder = cfg['clip'], cfg['folder']
+
+
+                # 2. Calculate usable range (respecting user-defined limits)
+                if cfg['is_still']:
+                    # Still image - no range restrictions
+                    slice_frames = min(plan[0], frames_to_fill - filled_so_far)
+
+
+                    clip_info = {
+                        "mediaPoolItem": clip,
+                        "mediaType": 1,
+                        "trackIndex": dest_track_idx,
+                        "recordFrame": record_pos
+                    }
+
+
+                    if not self.timeline_index.is_free(dest_track_idx, record_pos, record_pos + slice_frames):
+                        self.log(f"V{dest_track_idx} is occupied at frame {record_pos}, stopping.")
+                        self.stop_reason = "occupied"
+                        break
+
+
+                    # Change directory to support bins
+                    self.media_pool.SetCurrentFolder(folder)
+
+
+                    # Append slice to timeline
+                    items = self.media_pool.AppendToTimeline([clip_info])
+
+
+                    if items and items[0] and not items[0].Resize(slice_frames):
+                        # Left at its default length the still would desync everything after it
+                        if not self.timeline.DeleteClips([items[0]]):
+                            # It stays on the track: account for its real length, then stop
+                            item_end = items[0].GetEnd()
+                            self.timeline_index.add(dest_track_idx, record_pos, item_end)
+                            filled_so_far += item_end - record_pos
+                            clips_added += 1
+                            self.log(f"Could not remove {clip_name} after a failed resize, stopping.")
+                            self.stop_reason = "delete_failed"
+                            break
+                        items = None
+
+
+                    if items and items[0]:
+                        self.timeline_index.add(dest_track_idx, record_pos, record_pos + slice_frames)
+                        plan.popleft()
+                        if self.cost_policy:
+                            self.cost_policy.placed(clip_name, record_pos)
+
+
+                        filled_so_far += slice_frames
+                        clips_added += 1
+                        consecutive_failures = 0
+
+
+                        progress = (filled_so_far / frames_to_fill) * 100
+                        self.log(f"Added {clip_name} on V{dest_track_idx} ({progress:.1f}%)")
+                    else:
+                        consecutive_failures += 1
+                        self.log(f"FAILED to append {clip_name}")
+                        if consecutive_failures >= self.MAX_CONSECUTIVE_FAILURES:
+                            self.stop_reason = "failures"
+                            break
+
+
+                    continue
+
+
+                # 3. For video clips: respect range constraints
+                range_start_frames = int(cfg['range_start'] * FPS)
+                range_end_frames = int(cfg['range_end'] * FPS)
+                usable_duration = range_end_frames - range_start_frames
+
+
+                if usable_duration <= 0:
+                    # Skip clips with invalid ranges
+                    self._drop_clip(valid_clips, clip_name)
+                    self.log(f"Skipping {clip_name} - invalid range")
+                    continue
+
+
+                # 4. Determine slice size
+                remaining = frames_to_fill - filled_so_far
+                slice_frames = min(plan[0], remaining)
+                if usable_duration < slice_frames:
+                    # Shorter than planned: only take a length that leaves a tail the pacer can fill in bounds
+                    shorter = pacer.fit_shorter(usable_duration, remaining)
+                    if shorter is None and short_picks < self.MAX_SEGMENT_ATTEMPTS:
+                        short_picks += 1
+                        continue  # Try another clip
+                    slice_frames = shorter or usable_duration  # Every clip tried is too short: best effort
+                short_picks = 0
+
+
+                # 5. Find non-overlapping segment (if duplicate prevention enabled)
+                if self.prevent_duplicates:
+                    segment_found = False
+
+
+                    for attempt in range(self.MAX_SEGMENT_ATTEMPTS):
+                        start_offset = range_start_frames + random.randint(0, usable_duration - slice_frames)
+                        end_offset = start_offset + slice_frames
+
+
+                        # Check for overlap
+                        if not self._has_overlap(clip_name, start_offset, end_offset):
+                            segment_found = True
+                            break
+
+
+                    if not segment_found:
+                        # Clip exhausted - remove from pool and continue with others
+                        self._drop_clip(valid_clips, clip_name)
+                        self.log(f"All segments used for {clip_name}, skipping...")
+
+
+                        if not valid_clips:
+                            # No more clips available
+                            self.log("All clips exhausted!")
+                            self.stop_reason = "exhausted"
+                            break
+
+
+                        consecutive_failures = 0  # Reset since this isn't a failure
+                        continue
+                else:
+                    # No duplicate prevention - use any random segment
+                    start_offset = range_start_frames + random.randint(0, usable_duration - slice_frames)
+                    end_offset = start_offset + slice_frames
+
+
+                # 6. Append the slice
+                clip_info = {
+                    "mediaPoolItem": clip,
+                    "startFrame": start_offset,
+                    "endFrame": end_offset,
+                    "mediaType": 1,
+                    "trackIndex": dest_track_idx,
+                    "recordFrame": record_pos
+                }
+
+
+                if not self.timeline_index.is_free(dest_track_idx, record_pos, record_pos + slice_frames):
+                    self.log(f"V{dest_track_idx} is occupied at frame {record_pos}, stopping.")
+                    self.stop_reason = "occupied"
+                    break
+
+
+                # Change directory to support bins
+                self.media_pool.SetCurrentFolder(folder)
+
+
+                # Append slice to timeline
+                items = self.media_pool.AppendToTimeline([clip_info])
+
+
+                if items and items[0]:
+                    self.timeline_index.add(dest_track_idx, record_pos, record_pos + slice_frames)
+                    if self.cost_policy:
+                        self.cost_policy.placed(clip_name, record_pos)
+                    if slice_frames == plan[0]:
+                        plan.popleft()
+                    else:
+                        plan.clear()  # Clip was shorter than planned
+                    filled_so_far += slice_frames
+                    clips_added += 1
+                    consecutive_failures = 0
+
+
+                    # Record used segment
+                    if self.prevent_duplicates:
+                        self.used_segments.setdefault(clip_name, []).append((start_offset, end_offset))
+
+
+                    progress = (filled_so_far / frames_to_fill) * 100
+                    self.log(f"Added {clip_name} on V{dest_track_idx} ({progress:.1f}%)")
+                else:
+                    consecutive_failures += 1
+                    self.log(f"FAILED to append {clip_name}")
+                    if consecutive_failures >= self.MAX_CONSECUTIVE_FAILURES:
+                        self.stop_reason = "failures"
+                        break
+        finally:
+            # Restore media pool folder to root
+            self.media_pool.SetCurrentFolder(self.media_pool.GetRootFolder())
+
+
+        return clips_added, filled_so_far
+
+
+# --- GENERATION SETUP ---
+class GenerationError(Exception):
+    """A setting or timeline state that stops a run; `level` is "error", "warning" or "info"."""
+    def __init__(self, message, level="error"):
+        super().__init__(message)
+        self.level = level
+
+
+def parse_generation_settings(settings, clip_configs):
+    """Pacer and optional cost policy from the generator's settings (the preset 'settings' dict)"""
+    try:
+        min_f = int(float(settings['min']) * FPS)
+        max_f = int(float(settings['max']) * FPS)
+    except ValueError:
+        min_f = max_f = 0
+    if not 0 < min_f <= max_f:
+        raise GenerationError("Invalid min/max seconds.")
+    pacer = PacingEngine(settings['pacing'], min_f, max_f)
+
+
+    # Optional render cost policy (uses costs computed at scan time)
+    cost_policy = None
+    if settings['limit_heavy']:
+        try:
+            max_heavy = int(settings['heavy_max'])
+            window_frames = int(float(settings['heavy_window']) * FPS)
+        except ValueError:
+            raise GenerationError("Invalid heavy media limit.")
+        cost_policy = RenderCostPolicy(clip_configs, max_heavy, window_frames)
+    return pacer, cost_policy
+
+
+def setup_destination_track(timeline, timeline_index, selection, log=print):
+    """Create a new track or find an existing one, return (track_idx, start_pos)"""
+    if selection == "New Track":
+        timeline.AddTrack("video")
+        timeline.AddTrack("audio")  # Adding matched audio track
+        dest_track_idx = timeline.GetTrackCount("video")
+        timeline_index.add_empty_track(dest_track_idx)
+        current_timeline_pos = timeline_index.start_frame
+    else:
+        try:
+            # Parse "Track n" -> n
+            dest_track_idx = int(selection.split(" ")[1])
+        except (IndexError, ValueError):
+            raise GenerationError(f"Invalid track selection: {selection}")
+        # Start adding from the END of this track
+        current_timeline_pos = timeline_index.track_end(dest_track_idx)
+
+
+    log(f"Targeting Video Track {dest_track_idx} starting at frame {current_timeline_pos}")
+    return dest_track_idx, current_timeline_pos
+
+
+def parse_fill_frames(settings):
+    """Fixed fill length in frames, or None when matching Track 1"""
+    if settings['dur_mode'] == "match":
+        return None
+    try:
+        frames_to_fill = int(float(settings['total']) * FPS)
+    except ValueError:
+        frames_to_fill = 0
+    if frames_to_fill <= 0:
+        raise GenerationError("Invalid total seconds.")
+    return frames_to_fill
+
+
+def calculate_fill_duration(timeline_index, current_pos, fixed_frames=None):
+    """Frames to fill: `fixed_frames`, or up to the end of Track 1 when that is None"""
+    if fixed_frames is not None:
+        return fixed_frames
+    frames_to_fill = timeline_index.track_end(1) - current_pos
+    if frames_to_fill <= 0:
+        raise GenerationError("Selected track is already longer than Track 1. Nothing to add.", "info")
+    return frames_to_fill
+
+
+def prepare_clip_pool(clip_configs, selected_clips):
+    """Names of the selected clips that can be placed"""
+    if not selected_clips:
+        raise GenerationError("No clips selected!", "warning")
+    # Cached clips that are no longer in the Media Pool have no clip object
+    valid_clips = [name for name, cfg in clip_configs.items()
+                   if name in selected_clips and cfg['clip'] is not None]
+    if not valid_clips:
+        raise GenerationError("No valid clips found.")
+    return valid_clips
+
+
+def prepare_generation(timeline, timeline_index, clip_configs, selected_clips, settings, log=print):
+    """Everything a run decides before placing slices, without any UI.
+
+    `timeline_index` is the index from the previous run (or None); it is reused
+    while the timeline stays the same. Settings are checked before the timeline
+    is touched. Returns a dict for place_generation(); raises GenerationError.
+    """
+    pacer, cost_policy = parse_generation_settings(settings, clip_configs)
+    fixed_frames = parse_fill_frames(settings)
+    valid_clips = prepare_clip_pool(clip_configs, selected_clips)
+
+
+    # Track occupancy is kept between runs and re-checked cheaply, since the user may have edited
+    if timeline_index is None or timeline_index.uid != timeline.GetUniqueId():
+        timeline_index = TimelineIndex(timeline)
+    else:
+        timeline_index.begin_run(timeline)
+
+
+    dest_track_idx, current_pos = setup_destination_track(timeline, timeline_index, settings['track'], log)
+    return {
+        'timeline': timeline,
+        'timeline_index': timeline_index,
+        'track': dest_track_idx,
+        'start': current_pos,
+        'frames_to_fill': calculate_fill_duration(timeline_index, current_pos, fixed_frames),
+        'valid_clips': valid_clips,
+        'pacer': pacer,
+        'cost_policy': cost_policy,
+        'prevent_duplicates': bool(settings['prevent_duplicates']),
+    }
+
+
+def place_generation(media_pool, clip_configs, job, log=print):
+    """Run the placement loop for a prepare_generation() result. Returns the SlicePlacer and
+    (clips_added, frames_filled)."""
+    placer = SlicePlacer(media_pool, job['timeline'], job['timeline_index'], clip_configs,
+                         job['prevent_duplicates'], log, job['cost_policy'])
+    return placer, placer.run(job['track'], job['start'], job['frames_to_fill'], job['valid_clips'], job['pacer'])
+
+
 # --- MAIN LOGIC ---
 class BRollGenerator:
     def __init__(self, root):
@@ -40,12 +1183,35 @@ class BRollGenerator:
         self.root.eval('tk::PlaceWindow . center')  # center main window
         
         self.clip_configs = {}  # New data structure for clip configuration
-        self.used_segments = {}  # Track used segments for duplicate prevention
+        self.selected_clips = set()  # Names of selected clips (source of truth for checkboxes)
+        self.clip_index = ClipIndex()  # Search index over clip metadata
+        self.clip_uids = {}  # Clip unique ID -> clip name, for applying presets
+        self.timeline_index = None  # Track occupancy, kept across runs on the same timeline
+        self.presets = None  # Per-project stores, created once connected
+        self.scan_cache = None
+
+
+        # Background scan state
+        self.scan_iter = None  # Active scan generator, None when idle
+        self.scan_started = 0.0
+        self.scan_records = []
+        self.scan_live = {}  # Clip unique ID -> (clip, folder) from the current scan
+        self.session_restored = False
+        self.startup_report = ""
+
+
+        # Lazy row rendering
+        self.render_order = []  # Clip names in list order
+        self.rendered_count = 0  # Rows with widgets built so far
+        self.render_pending = False
 
 
         self.setup_ui()
-        self.scan_media_pool()
-        
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        # Connect and load clips only once the window is on screen
+        self.root.after_idle(lambda: self.root.after(0, self._deferred_start))
+
+
     def log(self, message):
         """Prints to console and updates UI label"""
         print(f"[LOG] {message}")
@@ -73,7 +1239,7 @@ class BRollGenerator:
 
 
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.configure(yscrollcommand=self._on_list_scroll)
 
 
         self.canvas.pack(side="left", fill="both", expand=True)
@@ -89,6 +1255,17 @@ class BRollGenerator:
         tk.Button(btn_frame, text="Refresh Clips", command=self.scan_media_pool).pack(side="left")
         self.lbl_count = tk.Label(btn_frame, text="Selected: 0", font=("Arial", 14, "bold"))
         self.lbl_count.pack(side="right")
+
+
+        # Query Selection (e.g. drone duration>30 bin:"Day 2")
+        query_frame = tk.Frame(self.root)
+        query_frame.pack(fill="x", padx=10)
+
+        tk.Label(query_frame, text="Query:").pack(side="left")
+        self.entry_query = tk.Entry(query_frame)
+        self.entry_query.pack(side="left", fill="x", expand=True, padx=5)
+        self.entry_query.bind("<Return>", lambda e: self.select_matching())
+        tk.Button(query_frame, text="Select Matches", command=self.select_matching).pack(side="left")
         
         # 2. Settings Area
         lbl_settings = tk.Label(self.root, text="2. Configuration:", font=("Arial", 14, "bold"))
@@ -121,6 +1298,30 @@ class BRollGenerator:
         tk.Checkbutton(frame_settings, text="Prevent Duplicate Segments",
                        variable=self.prevent_duplicates).grid(row=2, column=0, columnspan=4,
                                                               sticky="w", padx=5, pady=5)
+
+
+        # -- Slice Length Pacing --
+        tk.Label(frame_settings, text="Pacing:").grid(row=3, column=0, padx=5, pady=5)
+        self.pacing_var = tk.StringVar(value=PACING_MODES[0])
+        ttk.Combobox(frame_settings, textvariable=self.pacing_var, values=PACING_MODES,
+                     state="readonly", width=15).grid(row=3, column=1, columnspan=2, sticky="w")
+
+
+        # -- Render Cost (prefer proxies, cap heavy codecs per window) --
+        frame_cost = tk.Frame(frame_settings)
+        frame_cost.grid(row=4, column=0, columnspan=4, sticky="w", padx=5, pady=5)
+
+        self.limit_heavy = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame_cost, text="Prefer Light Media, max heavy clips:",
+                       variable=self.limit_heavy).pack(side="left")
+        self.entry_heavy_max = tk.Entry(frame_cost, width=3)
+        self.entry_heavy_max.insert(0, "1")
+        self.entry_heavy_max.pack(side="left")
+        tk.Label(frame_cost, text="per").pack(side="left", padx=5)
+        self.entry_heavy_window = tk.Entry(frame_cost, width=5)
+        self.entry_heavy_window.insert(0, "10")
+        self.entry_heavy_window.pack(side="left")
+        tk.Label(frame_cost, text="sec").pack(side="left", padx=5)
         
         # 3. Track Duration
         frame_dur = tk.LabelFrame(self.root, text="Target Duration Logic")
@@ -142,6 +1343,19 @@ class BRollGenerator:
         self.entry_total.pack(side="left", padx=5)
 
 
+        # Presets (selection, ranges and settings saved per project)
+        frame_presets = tk.LabelFrame(self.root, text="Presets")
+        frame_presets.pack(fill="x", padx=10)
+
+        self.preset_var = tk.StringVar()
+        self.combo_presets = ttk.Combobox(frame_presets, textvariable=self.preset_var, width=20)
+        self.combo_presets.pack(side="left", padx=5, pady=5)
+        tk.Button(frame_presets, text="Save", command=self.save_preset).pack(side="left", padx=(0, 5))
+        tk.Button(frame_presets, text="Load", command=lambda: self.load_preset(self.preset_var.get())).pack(side="left", padx=(0, 5))
+        tk.Button(frame_presets, text="Delete", command=self.delete_preset).pack(side="left")
+        self.refresh_preset_list()
+
+
         # 4. Status Bar
         self.lbl_status = tk.Label(self.root, text="Ready", bd=1, relief="sunken", anchor="w")
         self.lbl_status.pack(side="bottom", fill="x")
@@ -152,29 +1366,78 @@ class BRollGenerator:
                                     command=self.generate)
         self.btn_run.pack(fill="x", padx=20, pady=10, ipady=5)
         
+    def _deferred_start(self):
+        """Connect to Resolve, show cached clips, then rescan the Media Pool in the background"""
+        interactive_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+        if not connect_resolve():
+            self.log("Not connected to Resolve. Please run this script INSIDE DaVinci Resolve.")
+            return
+
+
+        project_name = project.GetName()
+        self.presets = PresetStore(project_name).load()
+        self.scan_cache = ScanCache(project_name)
+        self.refresh_preset_list()
+        self.update_tracks()
+
+
+        cached = self.scan_cache.load()
+        if cached:
+            self._load_clip_records(cached)
+            self.load_preset(LAST_SESSION, quiet=True)
+            self.session_restored = True
+        self.root.update_idletasks()
+
+
+        ready_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+        self.startup_report = (f"Startup: window interactive in {interactive_ms:.0f} ms, "
+                               f"{len(cached)} cached clips shown in {ready_ms:.0f} ms.")
+        self.log(self.startup_report)
+        self.scan_media_pool()
+
+
     def update_count(self):
-        count = sum(1 for name, cfg in self.clip_configs.items() if cfg['var'].get())
+        count = len(self.selected_clips)
         total = len(self.clip_configs)
         self.lbl_count.config(text=f"Selected: {count} / {total}")
 
 
-    def select_all(self):
+    def set_selection(self, names):
+        """Replace the selection in one operation, touching only widgets whose state changed"""
+        self.selected_clips = set(names) & set(self.clip_configs)
+
         for name, cfg in self.clip_configs.items():
-            cfg['var'].set(True)
-            if 'btn_config' in cfg:
+            selected = name in self.selected_clips
+            if not cfg['rendered'] or cfg['var'].get() == selected:
+                continue
+            cfg['var'].set(selected)
+            if selected:
                 cfg['btn_config'].grid()
+            else:
+                cfg['btn_config'].grid_remove()
+                if cfg['expanded']:
+                    cfg['config_frame'].pack_forget()
+                    cfg['expanded'] = False
         self.update_count()
 
 
+    def select_all(self):
+        self.set_selection(self.clip_configs)
+
+
     def select_none(self):
-        for name, cfg in self.clip_configs.items():
-            cfg['var'].set(False)
-            if 'btn_config' in cfg:
-                cfg['btn_config'].grid_remove()
-            if cfg['expanded']:
-                cfg['config_frame'].pack_forget()
-                cfg['expanded'] = False
-        self.update_count()
+        self.set_selection(())
+
+
+    def select_matching(self):
+        """Select exactly the clips matching the query expression"""
+        try:
+            matches = self.clip_index.query(self.entry_query.get())
+        except ValueError as e:
+            messagebox.showerror("Invalid Query", str(e))
+            return
+        self.set_selection(matches)
+        self.log(f"Query matched {len(matches)} clips.")
 
 
     def toggle_clip_config(self, clip_name):
@@ -198,29 +1461,32 @@ class BRollGenerator:
             cfg['expanded'] = True
 
 
+    def set_clip_range(self, clip_name, start, end):
+        """Update a clip's range in the model and, if its row is built, in the entries"""
+        cfg = self.clip_configs[clip_name]
+        cfg['range_start'], cfg['range_end'] = start, end
+        if cfg['rendered']:
+            cfg['start_var'].set(start)
+            cfg['end_var'].set(end)
+
+
     def reset_clip_range(self, clip_name):
         """Reset clip range to full duration"""
         cfg = self.clip_configs[clip_name]
-        cfg['range_start'].set(0.0)
-        cfg['range_end'].set(cfg['total_duration'])
+        self.set_clip_range(clip_name, 0.0, cfg['total_duration'])
 
 
     def validate_clip_range(self, clip_name):
         """Validate that start < end and both are within bounds"""
         cfg = self.clip_configs[clip_name]
-        start = cfg['range_start'].get()
-        end = cfg['range_end'].get()
+        start = cfg['range_start']
+        end = cfg['range_end']
         duration = cfg['total_duration']
 
 
-        if start < 0:
-            cfg['range_start'].set(0.0)
-        if end > duration:
-            cfg['range_end'].set(duration)
-        if start >= end:
-            # Reset to valid range
-            cfg['range_start'].set(0.0)
-            cfg['range_end'].set(duration)
+        # Also replaces any half-typed entry text; an invalid range resets to the full clip
+        self.set_clip_range(clip_name, *fit_clip_range(start, end, duration))
+        if max(0.0, start) >= min(end, duration):
             messagebox.showwarning("Invalid Range", f"Start time must be less than end time.\nResetting to full clip range.")
 
 
@@ -236,8 +1502,8 @@ class BRollGenerator:
 
 
         for name, cfg in self.clip_configs.items():
-            if cfg['var'].get() and not cfg['is_still']:  # If selected and not a still image
-                usable_range = cfg['range_end'].get() - cfg['range_start'].get()
+            if name in self.selected_clips and not cfg['is_still']:  # If selected and not a still image
+                usable_range = cfg['range_end'] - cfg['range_start']
                 if usable_range < max_duration:
                     short_clips.append({
                         'name': name,
@@ -260,187 +1526,227 @@ class BRollGenerator:
         return True
 
 
-    def _has_overlap(self, clip_name, new_start, new_end):
-        """Check if [new_start, new_end) overlaps with any used segment of this clip"""
-        if clip_name not in self.used_segments:
-            return False
+    def scan_media_pool(self):
+        """Start a Media Pool rescan that runs in small steps on the Tk event loop"""
+        if self.scan_iter is not None or not connect_resolve():
+            return
 
 
-        for seg_start, seg_end in self.used_segments[clip_name]:
-            # Overlap condition: NOT (new is completely before OR completely after existing)
-            if not (new_end <= seg_start or new_start >= seg_end):
-                return True
+        self.log("Scanning Media Pool & Tracks...")
+        self.scan_started = time.perf_counter()
+        self.scan_records = []
+        self.scan_live = {}
+        root_folder = media_pool.GetRootFolder()
+        self.scan_iter = iter_media_pool(root_folder, root_folder.GetName())
+        self.root.after(1, self._scan_step)
 
 
-        return False
+    def _scan_step(self, budget=SCAN_STEP_SEC):
+        """Scan clips until the time budget is spent. Returns True once the scan has finished."""
+        if self.scan_iter is None:
+            return True
 
 
-    def scan_media_pool(self):
-        if not media_pool: return
+        deadline = time.perf_counter() + budget
+        try:
+            for clip, folder, props, bin_path in self.scan_iter:
+                record = make_clip_record(clip, props, bin_path)
+                self.scan_records.append(record)
+                self.scan_live[record['uid']] = (clip, folder)
+                if time.perf_counter() >= deadline:
+                    self.lbl_status.config(text=f"Scanning Media Pool... {len(self.scan_records)} clips")
+                    self.root.after(1, self._scan_step)
+                    return False
+        except Exception as e:
+            self.scan_iter = None
+            self.log(f"Scan failed: {e}")
+            return True
 
 
-        self.log("Scanning Media Pool & Tracks...")
-        
-        # 1. Update Clips
-        for widget in self.scrollable_frame.winfo_children(): widget.destroy()
-        self.clip_configs = {}
-        root_folder = media_pool.GetRootFolder()
+        self.scan_iter = None
+        elapsed = time.perf_counter() - self.scan_started
+        self._load_clip_records(self.scan_records, self.scan_live)
+        self.update_tracks()
+        try:
+            if self.scan_cache:
+                self.scan_cache.save(self.scan_records)
+        except OSError as e:
+            print(f"[LOG] Could not save scan cache: {e}")
+
+
+        if not self.session_restored:
+            self.load_preset(LAST_SESSION, quiet=True)
+            self.session_restored = True
+        self.log(f"Found {len(self.scan_records)} clips in {elapsed:.2f}s. {self.startup_report}")
+        return True
 
 
-        def get_clips_recursive(folder):
-            found = []
-            clips = folder.GetClipList()
-            for clip in clips:
-                c_type = clip.GetClipProperty("Type")
-                if "Timeline" in c_type: continue
-                if "Video" in c_type or "Image" in c_type or "Stills" in c_type:
-                    found.append((clip, folder))
-            subfolders = folder.GetSubFolderList()
-            for sub in subfolders:
-                found.extend(get_clips_recursive(sub))
-            return found
+    def _load_clip_records(self, records, live=None):
+        """Bring the clip model and list up to date with scan records (see merge_clip_records)"""
+        merged = merge_clip_records(self.clip_configs, self.selected_clips, records, live)
+        if merged:
+            self.clip_configs, self.clip_uids, self.selected_clips = merged
+        self.clip_index = ClipIndex()
+        for key, record in zip(self.clip_configs, records):
+            self.clip_index.add(key, record)
+        self.clip_index.finalize()
+        if not merged:
+            return  # Refreshed in place, the rows stay
 
 
-        all_clips = get_clips_recursive(root_folder)
-        self.log(f"Found {len(all_clips)} clips.")
+        for widget in self.scrollable_frame.winfo_children(): widget.destroy()
+        self.render_order = list(self.clip_configs)
+        self.rendered_count = 0
+        self.canvas.yview_moveto(0)
 
 
-        if not all_clips:
+        if not records:
             tk.Label(self.scrollable_frame, text="No Video Clips Found!").pack()
-        else:
-            for clip, folder in all_clips:
-                clip_name = clip.GetName()
-                c_type = clip.GetClipProperty("Type")
-                is_still = "Still" in c_type or "Image" in c_type
+        self._render_more_rows()
+        self.update_count()
 
 
-                # Parse duration
-                if is_still:
-                    duration_sec = float('inf')
-                    duration_str = "∞"
-                else:
-                    dur = clip.GetClipProperty("Duration")
-                    if dur:
-                        duration_frames = parse_timecode_to_frames(dur)
-                        duration_sec = duration_frames / FPS
-                        minutes = int(duration_sec // 60)
-                        seconds = int(duration_sec % 60)
-                        duration_str = f"{minutes}:{seconds:02d}"
-                    else:
-                        duration_sec = 0
-                        duration_str = "0:00"
+    def _on_list_scroll(self, first, last):
+        """Scrollbar callback; builds more rows when the view nears the end of what is rendered"""
+        self.scrollbar.set(first, last)
+        if float(last) > 0.9 and self.rendered_count < len(self.render_order) and not self.render_pending:
+            self.render_pending = True
+            self.root.after_idle(self._render_more_rows)
 
 
-                # Create container frame that holds both clip row and config
-                container = tk.Frame(self.scrollable_frame)
-                container.pack(fill="x", padx=5, pady=2)
+    def _render_more_rows(self):
+        """Build widgets for the next chunk of clips"""
+        self.render_pending = False
+        end = min(self.rendered_count + ROW_CHUNK, len(self.render_order))
+        for clip_name in self.render_order[self.rendered_count:end]:
+            self._build_clip_row(clip_name)
+        self.rendered_count = end
 
 
-                # Create main clip row frame using grid for fixed button position
-                clip_row = tk.Frame(container)
-                clip_row.pack(fill="x")
-                clip_row.grid_columnconfigure(0, weight=1)
+    def _store_range(self, clip_name, key, var):
+        """Copy an edited range entry back into the model (ignores half-typed values)"""
+        try:
+            self.clip_configs[clip_name][key] = var.get()
+        except tk.TclError:
+            pass
 
 
-                # Checkbox and label
-                var = tk.BooleanVar(value=False)
+    def _build_clip_row(self, clip_name):
+        cfg = self.clip_configs[clip_name]
+        duration_sec = cfg['total_duration']
+        if cfg['is_still']:
+            duration_str = "∞"
+        else:
+            minutes = int(duration_sec // 60)
+            seconds = int(duration_sec % 60)
+            duration_str = f"{minutes}:{seconds:02d}"
 
 
-                chk = tk.Checkbutton(clip_row, text=f"{clip_name} ({duration_str})",
-                                     variable=var, anchor="w")
-                chk.grid(row=0, column=0, sticky="w")
+        # Create container frame that holds both clip row and config
+        container = tk.Frame(self.scrollable_frame)
+        container.pack(fill="x", padx=5, pady=2)
 
 
-                # Configure button - always in column 1, toggle visibility with grid_remove
-                btn_config = tk.Button(clip_row, text="⚙ Configure", font=("Arial", 14),
-                                       command=lambda cn=clip_name: self.toggle_clip_config(cn))
-                btn_config.grid(row=0, column=1, padx=5)
-                btn_config.grid_remove()  # Hidden initially, position reserved
+        # Create main clip row frame using grid for fixed button position
+        clip_row = tk.Frame(container)
+        clip_row.pack(fill="x")
+        clip_row.grid_columnconfigure(0, weight=1)
 
 
-                # Callback to show/hide configure button based on selection
-                def on_checkbox_toggle(v=var, btn=btn_config, cn=clip_name):
-                    if v.get():
-                        btn.grid()  # Shows in same grid position
-                    else:
-                        btn.grid_remove()  # Hides but keeps position
-                        # Also close config if open
-                        if cn in self.clip_configs and self.clip_configs[cn]['expanded']:
-                            self.clip_configs[cn]['config_frame'].pack_forget()
-                            self.clip_configs[cn]['expanded'] = False
-                    self.update_count()
+        # Checkbox and label
+        var = tk.BooleanVar(value=clip_name in self.selected_clips)
 
 
-                # Now configure the checkbox command
-                chk.config(command=on_checkbox_toggle)
+        chk = tk.Checkbutton(clip_row, text=f"{clip_name} ({duration_str})",
+                             variable=var, anchor="w")
+        chk.grid(row=0, column=0, sticky="w")
 
 
-                # Hidden configuration frame
-                config_frame = tk.Frame(container)
+        # Configure button - always in column 1, toggle visibility with grid_remove
+        btn_config = tk.Button(clip_row, text="⚙ Configure", font=("Arial", 14),
+                               command=lambda cn=clip_name: self.toggle_clip_config(cn))
+        btn_config.grid(row=0, column=1, padx=5)
+        if not var.get():
+            btn_config.grid_remove()  # Hidden initially, position reserved
 
 
-                if is_still:
-                    # For still images, show disabled inputs
-                    tk.Label(config_frame, text="Start:").pack(side="left", padx=5)
-                    entry_start = tk.Entry(config_frame, width=8, state="disabled", bd=1)
-                    entry_start.insert(0, "N/A")
-                    entry_start.pack(side="left")
+        # Callback to show/hide configure button based on selection
+        def on_checkbox_toggle(v=var, btn=btn_config, cn=clip_name):
+            if v.get():
+                self.selected_clips.add(cn)
+                btn.grid()  # Shows in same grid position
+            else:
+                self.selected_clips.discard(cn)
+                btn.grid_remove()  # Hides but keeps position
+                # Also close config if open
+                if cn in self.clip_configs and self.clip_configs[cn]['expanded']:
+                    self.clip_configs[cn]['config_frame'].pack_forget()
+                    self.clip_configs[cn]['expanded'] = False
+            self.update_count()
 
 
-                    tk.Label(config_frame, text="End:").pack(side="left", padx=5)
-                    entry_end = tk.Entry(config_frame, width=8, state="disabled", bd=1)
-                    entry_end.insert(0, "N/A")
-                    entry_end.pack(side="left")
+        # Now configure the checkbox command
+        chk.config(command=on_checkbox_toggle)
 
 
-                    range_start = tk.DoubleVar(value=0.0)
-                    range_end = tk.DoubleVar(value=999999.0)
-                else:
-                    # For video clips, create functional inputs
-                    range_start = tk.DoubleVar(value=0.0)
-                    range_end = tk.DoubleVar(value=duration_sec)
+        # Hidden configuration frame
+        config_frame = tk.Frame(container)
+        range_start = tk.DoubleVar(value=cfg['range_start'])
+        range_end = tk.DoubleVar(value=cfg['range_end'])
 
 
-                    tk.Label(config_frame, text="Start:").pack(side="left", padx=5)
-                    entry_start = tk.Entry(config_frame, textvariable=range_start, width=8, bd=1)
-                    entry_start.pack(side="left")
-                    entry_start.bind("<FocusOut>", lambda e, cn=clip_name: self.validate_clip_range(cn))
+        if cfg['is_still']:
+            # For still images, show disabled inputs
+            tk.Label(config_frame, text="Start:").pack(side="left", padx=5)
+            entry_start = tk.Entry(config_frame, width=8, state="disabled", bd=1)
+            entry_start.insert(0, "N/A")
+            entry_start.pack(side="left")
 
 
-                    tk.Label(config_frame, text="sec  End:").pack(side="left", padx=5)
-                    entry_end = tk.Entry(config_frame, textvariable=range_end, width=8, bd=1)
-                    entry_end.pack(side="left")
-                    entry_end.bind("<FocusOut>", lambda e, cn=clip_name: self.validate_clip_range(cn))
+            tk.Label(config_frame, text="End:").pack(side="left", padx=5)
+            entry_end = tk.Entry(config_frame, width=8, state="disabled", bd=1)
+            entry_end.insert(0, "N/A")
+            entry_end.pack(side="left")
+        else:
+            # For video clips, create functional inputs that write through to the model
+            range_start.trace_add("write", lambda *a, v=range_start: self._store_range(clip_name, 'range_start', v))
+            range_end.trace_add("write", lambda *a, v=range_end: self._store_range(clip_name, 'range_end', v))
 
 
-                    tk.Label(config_frame, text="sec").pack(side="left", padx=5)
+            tk.Label(config_frame, text="Start:").pack(side="left", padx=5)
+            entry_start = tk.Entry(config_frame, textvariable=range_start, width=8, bd=1)
+            entry_start.pack(side="left")
+            entry_start.bind("<FocusOut>", lambda e, cn=clip_name: self.validate_clip_range(cn))
 
 
-                    btn_reset = tk.Button(config_frame, text="Reset", font=("Arial", 14),
-                                          command=lambda cn=clip_name: self.reset_clip_range(cn))
-                    btn_reset.pack(side="left", padx=10)
+            tk.Label(config_frame, text="sec  End:").pack(side="left", padx=5)
+            entry_end = tk.Entry(config_frame, textvariable=range_end, width=8, bd=1)
+            entry_end.pack(side="left")
+            entry_end.bind("<FocusOut>", lambda e, cn=clip_name: self.validate_clip_range(cn))
 
 
-                # Store configuration
-                self.clip_configs[clip_name] = {
-                    'var': var,
-                    'clip': clip,
-                    'folder': folder,
-                    'total_duration': duration_sec,
-                    'range_start': range_start,
-                    'range_end': range_end,
-                    'config_frame': config_frame,
-                    'clip_row': clip_row,
-                    'btn_config': btn_config,
-                    'expanded': False,
-                    'is_still': is_still
-                }
+            tk.Label(config_frame, text="sec").pack(side="left", padx=5)
 
 
-        self.update_count()
+            btn_reset = tk.Button(config_frame, text="Reset", font=("Arial", 14),
+                                  command=lambda cn=clip_name: self.reset_clip_range(cn))
+            btn_reset.pack(side="left", padx=10)
+
 
+        # Store widget state alongside the model
+        cfg.update({
+            'var': var,
+            'start_var': range_start,
+            'end_var': range_end,
+            'config_frame': config_frame,
+            'clip_row': clip_row,
+            'btn_config': btn_config,
+            'rendered': True
+        })
 
-        # 2. Update Tracks (Logic: New Track OR Existing Tracks except V1)
+
+    def update_tracks(self):
+        """Refresh destination options (Logic: New Track OR Existing Tracks except V1)"""
         try:
             timeline = project.GetCurrentTimeline()
             if timeline:
@@ -449,58 +1755,169 @@ class BRollGenerator:
                 options = ["New Track"]
                 for i in range(2, track_count + 1):
                     options.append(f"Track {i}")
-                
+
+                current = self.track_var.get()
                 self.combo_tracks['values'] = options
-                self.combo_tracks.current(0) # Default to New Track
+                if current in options:
+                    self.track_var.set(current)
+                else:
+                    self.combo_tracks.current(0) # Default to New Track
         except Exception:
             self.combo_tracks['values'] = ["New Track"]
             self.combo_tracks.current(0)
 
 
-    def generate(self):
-        """Orchestrator - validates and delegates to sub-methods"""
-        timeline = self._validate_and_get_timeline()
-        if not timeline:
+    def refresh_preset_list(self):
+        self.combo_presets['values'] = self.presets.names() if self.presets else []
+
+
+    def _collect_preset(self):
+        """Snapshot selection, per-clip ranges and settings, keyed by clip unique ID"""
+        ranges = {}
+        for name, cfg in self.clip_configs.items():
+            if cfg['is_still']:
+                continue
+            start, end = cfg['range_start'], cfg['range_end']
+            if start != 0.0 or end != cfg['total_duration']:
+                ranges[cfg['uid']] = [round(start, 3), round(end, 3)]
+
+        return {
+            'selected': [self.clip_configs[name]['uid'] for name in self.selected_clips],
+            'ranges': ranges,
+            'settings': self._collect_settings(),
+        }
+
+
+    def _collect_settings(self):
+        """Generation settings as entered (also what prepare_generation() reads)"""
+        return {
+            'min': self.entry_min.get(),
+            'max': self.entry_max.get(),
+            'dur_mode': self.dur_mode.get(),
+            'total': self.entry_total.get(),
+            'prevent_duplicates': self.prevent_duplicates.get(),
+            'pacing': self.pacing_var.get(),
+            'limit_heavy': self.limit_heavy.get(),
+            'heavy_max': self.entry_heavy_max.get(),
+            'heavy_window': self.entry_heavy_window.get(),
+            'track': self.track_var.get(),
+        }
+
+
+    def apply_preset(self, preset):
+        """Apply a preset in a single pass using the uid map built during the scan"""
+        for uid, (start, end) in preset.get('ranges', {}).items():
+            name = self.clip_uids.get(uid)
+            if name:
+                cfg = self.clip_configs[name]
+                self.set_clip_range(name, *fit_clip_range(start, end, cfg['total_duration']))
+
+        self.set_selection(self.clip_uids[uid] for uid in preset.get('selected', []) if uid in self.clip_uids)
+
+
+        settings = preset.get('settings', {})
+        for entry, key in ((self.entry_min, 'min'), (self.entry_max, 'max'), (self.entry_total, 'total'),
+                           (self.entry_heavy_max, 'heavy_max'), (self.entry_heavy_window, 'heavy_window')):
+            if key in settings:
+                entry.delete(0, "end")
+                entry.insert(0, settings[key])
+        if settings.get('dur_mode') in ("match", "fixed"):
+            self.dur_mode.set(settings['dur_mode'])
+        self.prevent_duplicates.set(bool(settings.get('prevent_duplicates', False)))
+        if settings.get('pacing') in PACING_MODES:
+            self.pacing_var.set(settings['pacing'])
+        self.limit_heavy.set(bool(settings.get('limit_heavy', False)))
+        if settings.get('track') in self.combo_tracks['values']:
+            self.track_var.set(settings['track'])
+
+
+    def save_preset(self):
+        name = self.preset_var.get().strip()
+        if not self.presets or not name:
+            messagebox.showwarning("Warning", "Enter a preset name first.")
+            return
+        if name.lower() == LAST_SESSION.lower():
+            messagebox.showwarning("Warning", f"'{LAST_SESSION}' is reserved for the automatic session save.")
             return
+        try:
+            self.presets.save(name, self._collect_preset())
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save preset: {e}")
+            return
+        self.refresh_preset_list()
+        self.log(f"Saved preset '{name}'")
 
 
-        dest_track_idx, current_pos = self._setup_destination_track(timeline)
-        if dest_track_idx == 0:
+    def load_preset(self, name, quiet=False):
+        preset = self.presets.get(name) if self.presets else None
+        if not preset:
+            if not quiet:
+                messagebox.showwarning("Warning", f"Preset '{name}' not found.")
             return
+        self.apply_preset(preset)
+        self.log(f"Loaded preset '{name}' ({len(self.selected_clips)} clips selected)")
+
+
+    def delete_preset(self):
+        name = self.preset_var.get().strip()
+        if self.presets and name:
+            try:
+                self.presets.delete(name)
+            except OSError as e:
+                messagebox.showerror("Error", f"Could not delete preset: {e}")
+                return
+            self.preset_var.set("")
+            self.refresh_preset_list()
 
 
-        frames_to_fill = self._calculate_fill_duration(timeline, current_pos)
-        if frames_to_fill <= 0:
+    def save_session(self):
+        """Remember the current session so it is restored on next launch"""
+        if not self.presets:
             return
+        try:
+            self.presets.save(LAST_SESSION, self._collect_preset())
+        except OSError as e:
+            print(f"[LOG] Could not save session: {e}")
+
+
+    def on_close(self):
+        self.save_session()
+        self.root.destroy()
 
 
-        valid_clips = self._prepare_clip_pool()
-        if not valid_clips:
+    def generate(self):
+        """Orchestrator - validates and delegates to prepare_generation/place_generation"""
+        timeline = self._validate_and_get_timeline()
+        if not timeline:
             return
 
 
+        self.save_session()
+
+
+        # Clips shown from the scan cache need their live objects, so finish any pending scan
+        self._scan_step(budget=float('inf'))
+
+
         # Validate clip lengths before generation
         if not self.validate_clip_lengths():
             return  # User cancelled after seeing warning
 
 
-        # Get min/max settings
         try:
-            min_f = int(float(self.entry_min.get()) * FPS)
-            max_f = int(float(self.entry_max.get()) * FPS)
-        except ValueError:
-            messagebox.showerror("Error", "Invalid min/max seconds.")
+            job = prepare_generation(timeline, self.timeline_index, self.clip_configs, self.selected_clips,
+                                     self._collect_settings(), self.log)
+        except GenerationError as e:
+            show = {"info": messagebox.showinfo, "warning": messagebox.showwarning}.get(e.level, messagebox.showerror)
+            show(e.level.capitalize(), str(e))
             return
-
-
-        # Run the generation loop
-        self._run_generation_loop(timeline, dest_track_idx, current_pos,
-                                  frames_to_fill, valid_clips, min_f, max_f)
+        self.timeline_index = job['timeline_index']
+        self._run_generation_loop(job)
 
 
     def _validate_and_get_timeline(self):
         """Check project connection and timeline availability"""
-        if not project:
+        if not connect_resolve():
             messagebox.showerror("Error", "Not connected to Resolve.")
             return None
 
@@ -514,288 +1931,24 @@ class BRollGenerator:
         return timeline
 
 
-    def _get_track_end_time(self, timeline, track_idx):
-        """Get the end frame of a specific track"""
-        items = timeline.GetItemListInTrack("video", track_idx)
-        if not items:
-            return timeline.GetStartFrame()
-        return max([item.GetEnd() for item in items])
-
-
-    def _setup_destination_track(self, timeline):
-        """Create new track or find existing, return (track_idx, start_pos)"""
-        selection = self.track_var.get()
-        dest_track_idx = 0
-        current_timeline_pos = timeline.GetStartFrame()
-
-
-        if selection == "New Track":
-            timeline.AddTrack("video")
-            timeline.AddTrack("audio")  # Adding matched audio track
-            dest_track_idx = timeline.GetTrackCount("video")
-            current_timeline_pos = timeline.GetStartFrame()
-        else:
-            try:
-                # Parse "Track n" -> n
-                dest_track_idx = int(selection.split(" ")[1])
-
-
-                # Start adding from the END of this track
-                current_timeline_pos = self._get_track_end_time(timeline, dest_track_idx)
-            except:
-                messagebox.showerror("Error", f"Invalid track selection: {selection}")
-                return 0, 0
-
-
-        self.log(f"Targeting Video Track {dest_track_idx} starting at frame {current_timeline_pos}")
-        return dest_track_idx, current_timeline_pos
-
-
-    def _calculate_fill_duration(self, timeline, current_pos):
-        """Determine frames_to_fill based on match/fixed mode"""
-        frames_to_fill = 0
-
-
-        if self.dur_mode.get() == "match":
-            track1_end = self._get_track_end_time(timeline, 1)
-            frames_to_fill = track1_end - current_pos
-            if frames_to_fill <= 0:
-                messagebox.showinfo("Info", "Selected track is already longer than Track 1. Nothing to add.")
-                return 0
-        else:
-            # Fixed Seconds
-            try:
-                frames_to_fill = int(float(self.entry_total.get()) * FPS)
-            except ValueError:
-                messagebox.showerror("Error", "Invalid total seconds.")
-                return 0
-
-
-        return frames_to_fill
-
-
-    def _prepare_clip_pool(self):
-        """Validate selected clips and build working list"""
-        source_clips = [(cfg['clip'], cfg['folder'])
-                       for name, cfg in self.clip_configs.items() if cfg['var'].get()]
-
-
-        if not source_clips:
-            messagebox.showwarning("Warning", "No clips selected!")
-            return []
-
-
-        valid_clips = []
-        for clip, folder in source_clips:
-            clip_name = clip.GetName()
-            if clip_name in self.clip_configs:
-                valid_clips.append((clip, folder))
-
-
-        if not valid_clips:
-            messagebox.showerror("Error", "No valid clips found.")
-            return []
-
-
-        return valid_clips
-
-
-    def _run_generation_loop(self, timeline, dest_track_idx, current_pos,
-                            frames_to_fill, valid_clips, min_f, max_f):
-        """Main placement loop with duplicate tracking"""
-        # Initialize tracking
-        self.used_segments = {}
-        filled_so_far = 0
-        clips_added = 0
-        consecutive_failures = 0
-
-
+    def _run_generation_loop(self, job):
+        """Run the placement loop and report the result"""
         try:
-            while filled_so_far < frames_to_fill:
-                if not valid_clips:
-                    self.log("All clips exhausted!")
-                    break
-
-
-                # 1. Select random clip from pool
-                clip, folder = random.choice(valid_clips)
-                clip_name = clip.GetName()
-                cfg = self.clip_configs[clip_name]
-
-
-                # 2. Calculate usable range (respecting user-defined limits)
-                if cfg['is_still']:
-                    # Still image - no range restrictions
-                    slice_frames = random.randint(min_f, max_f)
-                    slice_frames = min(slice_frames, frames_to_fill - filled_so_far)
-
-
-                    # Record Frame = Start pos + what we've added so far
-                    record_pos = current_pos + filled_so_far
-
-
-                    clip_info = {
-                        "mediaPoolItem": clip,
-                        "mediaType": 1,
-                        "trackIndex": dest_track_idx,
-                        "recordFrame": record_pos
-                    }
-
-
-                    # Change directory to support bins
-                    media_pool.SetCurrentFolder(folder)
-
-
-                    # Append slice to timeline
-                    items = media_pool.AppendToTimeline([clip_info])
-
-
-                    if items and items[0]:
-                        items[0].Resize(slice_frames)
-
-
-                        filled_so_far += slice_frames
-                        clips_added += 1
-                        consecutive_failures = 0
-
-
-                        progress = (filled_so_far / frames_to_fill) * 100
-                        self.log(f"Added {clip_name} on V{dest_track_idx} ({progress:.1f}%)")
-                    else:
-                        consecutive_failures += 1
-                        self.log(f"FAILED to append {clip_name}")
-                        if consecutive_failures >= 5:
-                            break
-
-
-                    continue
-
-
-                # 3. For video clips: respect range constraints
-                range_start_frames = int(cfg['range_start'].get() * FPS)
-                range_end_frames = int(cfg['range_end'].get() * FPS)
-                usable_duration = range_end_frames - range_start_frames
-
-
-                if usable_duration <= 0:
-                    # Skip clips with invalid ranges
-                    valid_clips.remove((clip, folder))
-                    self.log(f"Skipping {clip_name} - invalid range")
-                    continue
-
-
-                # 4. Determine slice size
-                slice_frames = random.randint(min_f, max_f)
-                slice_frames = min(slice_frames, usable_duration)
-                slice_frames = min(slice_frames, frames_to_fill - filled_so_far)
-
-
-                # 5. Find non-overlapping segment (if duplicate prevention enabled)
-                if self.prevent_duplicates.get():
-                    segment_found = False
-
-
-                    for attempt in range(10):  # Max 10 retries per clip
-                        if usable_duration < slice_frames:
-                            # Clip too short for desired slice
-                            break
-
-
-                        start_offset = range_start_frames + random.randint(0, usable_duration - slice_frames)
-                        end_offset = start_offset + slice_frames
-
-
-                        # Check for overlap
-                        if not self._has_overlap(clip_name, start_offset, end_offset):
-                            segment_found = True
-                            break
-
-
-                    if not segment_found:
-                        # Clip exhausted - remove from pool and continue with others
-                        valid_clips.remove((clip, folder))
-                        self.log(f"All segments used for {clip_name}, skipping...")
-
-
-                        if not valid_clips:
-                            # No more clips available
-                            self.log("All clips exhausted!")
-                            break
-
-
-                        consecutive_failures = 0  # Reset since this isn't a failure
-                        continue
-                else:
-                    # No duplicate prevention - use any random segment
-                    if usable_duration < slice_frames:
-                        slice_frames = usable_duration
-
-
-                    start_offset = range_start_frames + random.randint(0, max(0, usable_duration - slice_frames))
-                    end_offset = start_offset + slice_frames
-
-
-                # 6. Record Frame = Start pos + what we've added so far
-                record_pos = current_pos + filled_so_far
-
-
-                clip_info = {
-                    "mediaPoolItem": clip,
-                    "startFrame": start_offset,
-                    "endFrame": end_offset,
-                    "mediaType": 1,
-                    "trackIndex": dest_track_idx,
-                    "recordFrame": record_pos
-                }
-
-
-                # Change directory to support bins
-                media_pool.SetCurrentFolder(folder)
-
-
-                # Append slice to timeline
-                items = media_pool.AppendToTimeline([clip_info])
-
-
-                if items and items[0]:
-                    filled_so_far += slice_frames
-                    clips_added += 1
-                    consecutive_failures = 0
-
-
-                    # Record used segment
-                    if self.prevent_duplicates.get():
-                        if clip_name not in self.used_segments:
-                            self.used_segments[clip_name] = []
-                        self.used_segments[clip_name].append((start_offset, end_offset))
-
-
-                    progress = (filled_so_far / frames_to_fill) * 100
-                    self.log(f"Added {clip_name} on V{dest_track_idx} ({progress:.1f}%)")
-                else:
-                    consecutive_failures += 1
-                    self.log(f"FAILED to append {clip_name}")
-                    if consecutive_failures >= 5:
-                        break
-
-
-            messagebox.showinfo("Done", f"Added {clips_added} clips to V{dest_track_idx}")
+            placer, (clips_added, filled) = place_generation(media_pool, self.clip_configs, job, self.log)
+            message = f"Added {clips_added} clips to V{job['track']}"
+            if placer.stop_reason != "complete":
+                message += (f"\nStopped early ({placer.stop_reason}): "
+                            f"filled {filled / FPS:.1f}s of {job['frames_to_fill'] / FPS:.1f}s")
+            messagebox.showinfo("Done", message)
         except Exception as e:
             self.log(f"CRITICAL ERROR: {str(e)}")
             messagebox.showerror("Error", str(e))
         finally:
-            # Restore media pool folder to root
-            if media_pool:
-                root = media_pool.GetRootFolder()
-                media_pool.SetCurrentFolder(root)
-
-
             self.log("Done.")
 
 
 if __name__ == "__main__":
-    if resolve:
-        root = tk.Tk()
-        root.attributes("-topmost", True) 
-        app_gui = BRollGenerator(root)
-        root.mainloop()
+    root = tk.Tk()
+    root.attributes("-topmost", True)
+    app_gui = BRollGenerator(root)
+    root.mainloop()
@@ -0,0 +1,456 @@
+"""Local stand-in for the DaVinci Resolve scripting objects.
+
+Runs the B-roll generation path (scan -> plan -> place) outside Resolve, with
+configurable per-call latency and failure rates, and checks the result:
+
+    python mock_resolve.py                              # load test at several pool sizes
+    python mock_resolve.py --append-failure 0.3 --resize-failure 0.3 --delete-failure 0.5
+    python mock_resolve.py --sizes 50 500 --latency-ms 0.5 --no-dedupe
+    python mock_resolve.py --heavy-limit 1 10
+
+Only the calls Broller.py makes are implemented.
+"""
+import argparse
+import random
+import sys
+import time
+
+import Broller
+
+
+# --- LATENCY / FAULT INJECTION ---
+class MockEnv:
+    """Shared call accounting. `latency` maps method name (or "*") to (mean, stdev) seconds,
+    `failures` maps method name to the probability that a call fails."""
+    def __init__(self, latency=None, failures=None, seed=None):
+        self.latency = latency or {}
+        self.failures = failures or {}
+        self.rng = random.Random(seed)
+        self.calls = {}
+
+
+    def call(self, method):
+        """Account for one API call; returns True if it should fail"""
+        self.calls[method] = self.calls.get(method, 0) + 1
+        mean, stdev = self.latency.get(method, self.latency.get("*", (0.0, 0.0)))
+        if mean > 0:
+            time.sleep(max(0.0, self.rng.gauss(mean, stdev)))
+        return self.rng.random() < self.failures.get(method, 0.0)
+
+
+    def total_calls(self):
+        return sum(self.calls.values())
+
+
+# --- MEDIA POOL ---
+class MockClip:
+    def __init__(self, env, uid, name, props):
+        self.env = env
+        self.uid = uid
+        self.name = name
+        self.props = props
+
+
+    def GetName(self):
+        self.env.call("GetName")
+        return self.name
+
+
+    def GetUniqueId(self):
+        self.env.call("GetUniqueId")
+        return self.uid
+
+
+    def GetClipProperty(self, key=None):
+        self.env.call("GetClipProperty")
+        if key is None:
+            return dict(self.props)
+        return self.props.get(key, "")
+
+
+class MockFolder:
+    def __init__(self, env, name, clips=None, subfolders=None):
+        self.env = env
+        self.name = name
+        self.clips = clips or []
+        self.subfolders = subfolders or []
+
+
+    def GetName(self):
+        self.env.call("GetName")
+        return self.name
+
+
+    def GetClipList(self):
+        self.env.call("GetClipList")
+        return list(self.clips)
+
+
+    def GetSubFolderList(self):
+        self.env.call("GetSubFolderList")
+        return list(self.subfolders)
+
+
+class MockMediaPool:
+    def __init__(self, env, root_folder, timeline):
+        self.env = env
+        self.root_folder = root_folder
+        self.current_folder = root_folder
+        self.timeline = timeline
+
+
+    def GetRootFolder(self):
+        self.env.call("GetRootFolder")
+        return self.root_folder
+
+
+    def SetCurrentFolder(self, folder):
+        self.env.call("SetCurrentFolder")
+        self.current_folder = folder
+        return True
+
+
+    def AppendToTimeline(self, clip_infos):
+        if self.env.call("AppendToTimeline"):
+            return [None] * len(clip_infos)
+        return [self.timeline.append(info) for info in clip_infos]
+
+
+# --- TIMELINE ---
+class MockTimelineItem:
+    def __init__(self, env, clip, track_idx, start, end, source_start, source_end):
+        self.env = env
+        self.clip = clip
+        self.track_idx = track_idx
+        self.start = start
+        self.end = end
+        self.source_start = source_start
+        self.source_end = source_end
+
+
+    def GetStart(self):
+        self.env.call("GetStart")
+        return self.start
+
+
+    def GetEnd(self):
+        self.env.call("GetEnd")
+        return self.end
+
+
+    def Resize(self, frames):
+        if self.env.call("Resize"):
+            return False
+        self.end = self.start + frames
+        return True
+
+
+class MockTimeline:
+    STILL_DEFAULT_FRAMES = 120  # Length a still gets when appended without a range
+
+
+    def __init__(self, env, start_frame=86400, video_tracks=1, uid="uid-timeline"):
+        self.env = env
+        self.uid = uid
+        self.start_frame = start_frame
+        self.tracks = {i: [] for i in range(1, video_tracks + 1)}
+        self.audio_tracks = video_tracks
+
+
+    def append(self, info):
+        record = info["recordFrame"]
+        if "startFrame" in info:
+            source_start, source_end = info["startFrame"], info["endFrame"]
+        else:
+            source_start, source_end = 0, self.STILL_DEFAULT_FRAMES
+        item = MockTimelineItem(self.env, info["mediaPoolItem"], info["trackIndex"], record,
+                                record + source_end - source_start, source_start, source_end)
+        self.tracks[info["trackIndex"]].append(item)
+        return item
+
+
+    def GetUniqueId(self):
+        self.env.call("GetUniqueId")
+        return self.uid
+
+
+    def GetStartFrame(self):
+        self.env.call("GetStartFrame")
+        return self.start_frame
+
+
+    def GetTrackCount(self, track_type):
+        self.env.call("GetTrackCount")
+        return len(self.tracks) if track_type == "video" else self.audio_tracks
+
+
+    def AddTrack(self, track_type):
+        self.env.call("AddTrack")
+        if track_type == "video":
+            self.tracks[len(self.tracks) + 1] = []
+        else:
+            self.audio_tracks += 1
+        return True
+
+
+    def GetItemListInTrack(self, track_type, track_idx):
+        self.env.call("GetItemListInTrack")
+        # Resolve lists items in timeline order, whatever order they were added in
+        return sorted(self.tracks.get(track_idx, []), key=lambda item: item.start)
+
+
+    def DeleteClips(self, items):
+        if self.env.call("DeleteClips"):
+            return False
+        for item in items:
+            self.tracks[item.track_idx].remove(item)
+        return True
+
+
+# --- PROJECT / APP ---
+class MockProject:
+    def __init__(self, env, media_pool, timeline, fps=24.0, name="Mock Project"):
+        self.env = env
+        self.media_pool = media_pool
+        self.timeline = timeline
+        self.fps = fps
+        self.name = name
+
+
+    def GetName(self):
+        self.env.call("GetName")
+        return self.name
+
+
+    def GetSetting(self, key):
+        self.env.call("GetSetting")
+        return str(self.fps) if key == "timelineFrameRate" else ""
+
+
+    def GetMediaPool(self):
+        self.env.call("GetMediaPool")
+        return self.media_pool
+
+
+    def GetCurrentTimeline(self):
+        self.env.call("GetCurrentTimeline")
+        return self.timeline
+
+
+class MockApp:
+    """Plays the role of the `app` global Resolve injects into scripts"""
+    def __init__(self, project):
+        self.project = project
+
+
+    def GetResolve(self):
+        return self
+
+
+    def GetProjectManager(self):
+        return self
+
+
+    def GetCurrentProject(self):
+        return self.project
+
+
+def frames_to_timecode(frames, fps):
+    fps = int(round(fps))
+    seconds, f = divmod(frames, fps)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}:{f:02d}"
+
+
+def build_project(pool_size, env=None, fps=24.0, still_ratio=0.1, bins=10, seed=None, clip_seconds=(5, 300)):
+    """Media pool with `pool_size` clips spread over `bins` bins, and a timeline whose
+    Track 1 holds a single 10 minute A-roll item. Clip durations are drawn from `clip_seconds`."""
+    env = env or MockEnv()
+    rng = random.Random(seed)
+    subfolders = [MockFolder(env, f"Day {i + 1}") for i in range(bins)]
+    for i in range(pool_size):
+        is_still = rng.random() < still_ratio
+        props = {
+            "Type": "Image" if is_still else "Video + Audio",
+            "Duration": frames_to_timecode(rng.randint(*(int(sec * fps) for sec in clip_seconds)), fps),
+            "FPS": str(fps),
+            "Resolution": rng.choice(["1920x1080", "3840x2160", "7680x4320"]),
+            "Video Codec": rng.choice(["Apple ProRes 422", "H.264", "H.265", "Blackmagic RAW"]),
+            "Proxy": rng.choice(["None", "None", "1/2 Resolution"]),
+            "Clip Color": rng.choice(["", "Orange", "Blue"]),
+            "Keywords": rng.choice(["", "drone", "interview", "city"]),
+        }
+        subfolders[i % bins].clips.append(MockClip(env, f"uid-{i}", f"clip_{i:05d}", props))
+    root_folder = MockFolder(env, "Master", subfolders=subfolders)
+
+
+    timeline = MockTimeline(env)
+    a_roll = MockClip(env, "uid-a-roll", "a_roll", {"Type": "Video + Audio"})
+    timeline.append({"mediaPoolItem": a_roll, "trackIndex": 1, "recordFrame": timeline.start_frame,
+                     "startFrame": 0, "endFrame": int(600 * fps)})
+    media_pool = MockMediaPool(env, root_folder, timeline)
+    return MockApp(MockProject(env, media_pool, timeline, fps))
+
+
+# --- END TO END RUN ---
+def run_generation(mock_app, prevent_duplicates=True, pacing="Uniform", min_sec=2.0, max_sec=5.0,
+                   heavy_limit=None, track="New Track", total_sec=None, timeline_index=None):
+    """Scan the media pool, select every clip and generate through the same setup and placement
+    functions as BRollGenerator.generate(). `heavy_limit` is an optional (max heavy slices,
+    window seconds) render cost cap; `total_sec` switches from matching Track 1 to a fixed
+    length. Pass a previous result's 'timeline_index' to reuse it, as the generator does."""
+    Broller.app = mock_app
+    Broller.project = None
+    Broller.connect_resolve()
+    media_pool, project = Broller.media_pool, Broller.project
+    env = project.env
+
+
+    calls_before = env.total_calls()
+    started = time.perf_counter()
+    records, live = [], {}
+    root_folder = media_pool.GetRootFolder()
+    for clip, folder, props, bin_path in Broller.iter_media_pool(root_folder, root_folder.GetName()):
+        record = Broller.make_clip_record(clip, props, bin_path)
+        records.append(record)
+        live[record['uid']] = (clip, folder)
+    clip_configs, _, _ = Broller.merge_clip_records({}, set(), records, live)
+    scan_sec = time.perf_counter() - started
+    scan_calls = env.total_calls() - calls_before
+
+
+    settings = {
+        'min': str(min_sec),
+        'max': str(max_sec),
+        'dur_mode': "match" if total_sec is None else "fixed",
+        'total': str(total_sec),
+        'prevent_duplicates': prevent_duplicates,
+        'pacing': pacing,
+        'limit_heavy': bool(heavy_limit),
+        'heavy_max': str(heavy_limit[0]) if heavy_limit else "",
+        'heavy_window': str(heavy_limit[1]) if heavy_limit else "",
+        'track': track,
+    }
+    calls_before = env.total_calls()
+    started = time.perf_counter()
+    job = Broller.prepare_generation(project.GetCurrentTimeline(), timeline_index, clip_configs,
+                                     set(clip_configs), settings, log=lambda message: None)
+    placer, (clips_added, filled) = Broller.place_generation(media_pool, clip_configs, job,
+                                                             log=lambda message: None)
+
+
+    return {
+        'clip_configs': clip_configs,
+        'heavy_limit': heavy_limit,
+        'timeline': job['timeline'],
+        'timeline_index': job['timeline_index'],
+        'track': job['track'],
+        'start': job['start'],
+        'frames_to_fill': job['frames_to_fill'],
+        'clips_added': clips_added,
+        'filled': filled,
+        'stop_reason': placer.stop_reason,
+        'scan_sec': scan_sec,
+        'scan_calls': scan_calls,
+        'place_sec': time.perf_counter() - started,
+        'place_calls': env.total_calls() - calls_before,
+    }
+
+
+def check_invariants(result, prevent_duplicates, allow_early_stop=False):
+    """List of invariant violations in a run_generation() result (empty when all hold).
+    With `allow_early_stop`, stopping on injected API failures is not itself a violation."""
+    problems = []
+    items = sorted((item for item in result['timeline'].tracks[result['track']] if item.start >= result['start']),
+                   key=lambda item: item.start)
+
+
+    # Slices tile the track from the start with no overlaps or gaps
+    pos = result['start']
+    for item in items:
+        if item.start != pos:
+            problems.append(f"{'overlap' if item.start < pos else 'gap'} at frame {item.start} (expected {pos})")
+        pos = max(pos, item.end)
+    placed = pos - result['start']
+    if placed != result['filled'] or len(items) != result['clips_added']:
+        problems.append(f"timeline has {len(items)} items / {placed} frames, "
+                        f"placer reported {result['clips_added']} / {result['filled']}")
+    reason = result['stop_reason']
+    if (reason == "complete") != (result['filled'] == result['frames_to_fill']):
+        problems.append(f"stopped ({reason}) after {result['filled']} of {result['frames_to_fill']} frames")
+    elif reason != "complete" and not (allow_early_stop and reason in ("failures", "delete_failed")):
+        problems.append(f"stopped early ({reason}) after {result['filled']} of {result['frames_to_fill']} frames")
+
+
+    # No clip is used twice for overlapping source ranges
+    if prevent_duplicates:
+        by_clip = {}
+        for item in items:
+            if item.clip.props.get("Type") != "Image":
+                by_clip.setdefault(item.clip.uid, []).append((item.source_start, item.source_end))
+        for uid, segments in by_clip.items():
+            segments.sort()
+            for (_, prev_end), (next_start, _) in zip(segments, segments[1:]):
+                if next_start < prev_end:
+                    problems.append(f"duplicate source segment in {uid}")
+                    break
+
+
+    # Heavy slices per window stay under the cap (pools built here always have light clips)
+    if result['heavy_limit']:
+        max_heavy, window_sec = result['heavy_limit']
+        window = int(window_sec * Broller.FPS)
+        heavy_uids = {cfg['uid'] for cfg in result['clip_configs'].values() if cfg['heavy']}
+        heavy = [item.start for item in items if item.clip.uid in heavy_uids]
+        for i in range(len(heavy) - max_heavy):
+            if heavy[i + max_heavy] - heavy[i] < window:
+                problems.append(f"{max_heavy + 1} heavy slices within {window_sec}s at frame {heavy[i]}")
+                break
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run B-roll generation against a mock Resolve.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000], help="media pool sizes")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="mean latency per API call")
+    parser.add_argument("--append-failure", type=float, default=0.0, help="AppendToTimeline failure rate")
+    parser.add_argument("--resize-failure", type=float, default=0.0, help="still Resize failure rate")
+    parser.add_argument("--delete-failure", type=float, default=0.0, help="DeleteClips failure rate")
+    parser.add_argument("--pacing", default="Uniform", choices=Broller.PACING_MODES)
+    parser.add_argument("--no-dedupe", action="store_true", help="disable duplicate prevention")
+    parser.add_argument("--heavy-limit", type=float, nargs=2, metavar=("MAX", "SECONDS"),
+                        help="cap heavy-codec slices per window of timeline seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+
+    prevent_duplicates = not args.no_dedupe
+    faults = args.append_failure > 0 or args.resize_failure > 0 or args.delete_failure > 0
+    latency = (args.latency_ms / 1000, args.latency_ms / 4000)
+    random.seed(args.seed)
+
+
+    print(f"{'pool':>6} {'scan s':>8} {'calls':>7} {'place s':>8} {'calls':>7} {'slices':>7} {'slices/s':>9}  result")
+    failed = False
+    for size in args.sizes:
+        env = MockEnv(latency={"*": latency},
+                      failures={"AppendToTimeline": args.append_failure, "Resize": args.resize_failure,
+                                "DeleteClips": args.delete_failure},
+                      seed=args.seed)
+        heavy_limit = (int(args.heavy_limit[0]), args.heavy_limit[1]) if args.heavy_limit else None
+        result = run_generation(build_project(size, env, seed=args.seed), prevent_duplicates, args.pacing,
+                                heavy_limit=heavy_limit)
+        # With faults injected the consecutive-failure stop may end the fill early
+        problems = check_invariants(result, prevent_duplicates, allow_early_stop=faults)
+        failed = failed or bool(problems)
+        rate = result['clips_added'] / result['place_sec'] if result['place_sec'] else float('inf')
+        status = '; '.join(problems) if problems else 'ok'
+        if not problems and result['stop_reason'] != "complete":
+            status += f" (stopped: {result['stop_reason']})"
+        print(f"{size:>6} {result['scan_sec']:>8.3f} {result['scan_calls']:>7} {result['place_sec']:>8.3f} "
+              f"{result['place_calls']:>7} {result['clips_added']:>7} {rate:>9.0f}  "
+              f"{status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
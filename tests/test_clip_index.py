@@ -0,0 +1,61 @@
+import pytest
+
+from Broller import ClipIndex
+
+
+def make_index():
+    index = ClipIndex()
+    clips = {
+        "drone_a": {"bin": "Master/Day 2", "keywords": "aerial, Sunset", "duration": 45.0,
+                    "height": 2160, "codec": "H.265"},
+        "drone_b": {"bin": "Master/Day 20", "keywords": "aerial", "duration": 12.0,
+                    "height": 1080, "codec": "H.264"},
+        "interview": {"bin": "Master/Day 2/Audio", "color": "Orange", "duration": 600.0,
+                      "height": 1080, "codec": "Apple ProRes 422"},
+        "logo": {"bin": "Master/Graphics", "duration": float("inf"), "height": 1080},
+    }
+    for name, meta in clips.items():
+        index.add(name, meta)
+    index.finalize()
+    return index
+
+
+def test_bare_word_is_prefix_match():
+    index = make_index()
+    assert index.query("bin:day") == {"drone_a", "drone_b", "interview"}
+    assert index.query("bin:2") == {"drone_a", "drone_b", "interview"}
+
+
+def test_quoted_value_matches_path_component_exactly():
+    index = make_index()
+    assert index.query('bin:"Day 2"') == {"drone_a", "interview"}
+    assert index.query('bin:"day  2"') == {"drone_a", "interview"}
+    assert index.query('bin:"Master/Day 20"') == {"drone_b"}
+    assert index.query('bin:"Day"') == set()
+
+
+def test_quoted_alternatives_and_keywords():
+    index = make_index()
+    assert index.query('bin:"Day 20|Graphics"') == {"drone_b", "logo"}
+    assert index.query('kw:"sunset"') == {"drone_a"}
+    assert index.query('"orange"') == {"interview"}
+
+
+def test_numeric_comparisons_and_negation():
+    index = make_index()
+    assert index.query("duration>30") == {"drone_a", "interview"}
+    assert index.query("h>=2160") == {"drone_a"}
+    assert index.query("aerial -codec:h.265") == {"drone_b"}
+
+
+def test_stills_never_match_duration():
+    index = make_index()
+    assert "logo" not in index.query("duration>30")
+    assert "logo" not in index.query("duration<=100000")
+    assert "logo" in index.query("height=1080")
+
+
+@pytest.mark.parametrize("expression", ["", "   ", "bin:", 'bin:""', "duration>abc", "foo:bar", '"open'])
+def test_invalid_queries_raise(expression):
+    with pytest.raises(ValueError):
+        make_index().query(expression)
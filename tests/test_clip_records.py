@@ -0,0 +1,77 @@
+import json
+
+import Broller
+from Broller import ScanCache, make_clip_config, merge_clip_records
+
+
+def record(uid, name, duration=60.0, is_still=False, cost=1.0, heavy=False, bin_path="Master"):
+    return {'uid': uid, 'name': name, 'bin': bin_path, 'duration': duration, 'is_still': is_still,
+            'cost': cost, 'heavy': heavy}
+
+
+def test_scan_cache_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(Broller, "DATA_DIR", str(tmp_path))
+    records = [record("uid-1", "a.mov"), record("uid-2", "logo.png", float("inf"), True, 0.1)]
+    ScanCache("Project").save(records)
+    assert ScanCache("Project").load() == records
+    assert ScanCache("Other").load() == []
+
+
+def test_scan_cache_rejects_version_or_fps_mismatch(tmp_path, monkeypatch):
+    monkeypatch.setattr(Broller, "DATA_DIR", str(tmp_path))
+    cache = ScanCache("Project")
+    cache.save([record("uid-1", "a.mov")])
+
+    monkeypatch.setattr(Broller, "FPS", 25.0)
+    assert cache.load() == []
+    monkeypatch.setattr(Broller, "FPS", 24.0)
+    assert len(cache.load()) == 1
+
+    with open(cache.path) as f:
+        data = json.load(f)
+    data['version'] = ScanCache.VERSION - 1
+    with open(cache.path, "w") as f:
+        json.dump(data, f)
+    assert cache.load() == []
+
+
+def test_same_layout_is_refreshed_in_place():
+    cached = [record("uid-1", "a.mov", cost=1.0), record("uid-2", "b.mov", cost=1.5)]
+    configs = {r['name']: make_clip_config(r) for r in cached}
+    configs["a.mov"]['range_start'] = 5.0
+    kept = dict(configs)
+
+    fresh = [record("uid-1", "a.mov", cost=0.5), record("uid-2", "b.mov", cost=2.5, heavy=True)]
+    live = {"uid-1": ("clip-1", "folder-1"), "uid-2": ("clip-2", "folder-2")}
+    assert merge_clip_records(configs, {"a.mov"}, fresh, live) is None
+
+    assert configs == kept and configs["a.mov"] is kept["a.mov"]
+    assert (configs["a.mov"]['clip'], configs["a.mov"]['folder']) == ("clip-1", "folder-1")
+    assert (configs["a.mov"]['cost'], configs["a.mov"]['heavy']) == (0.5, False)
+    assert (configs["b.mov"]['cost'], configs["b.mov"]['heavy']) == (2.5, True)
+    assert configs["a.mov"]['range_start'] == 5.0
+
+
+def test_changed_layout_carries_selection_and_ranges_by_uid():
+    cached = [record("uid-1", "a.mov", 60.0), record("uid-2", "b.mov", 60.0), record("uid-3", "c.mov", 60.0)]
+    configs = {r['name']: make_clip_config(r) for r in cached}
+    configs["a.mov"]['range_start'], configs["a.mov"]['range_end'] = 10.0, 50.0
+    configs["b.mov"]['range_start'], configs["b.mov"]['range_end'] = 40.0, 55.0
+
+    # a.mov renamed, b.mov trimmed to 30 s, c.mov removed, d.mov added
+    fresh = [record("uid-2", "b.mov", 30.0), record("uid-1", "a_renamed.mov", 60.0), record("uid-4", "d.mov")]
+    clip_configs, clip_uids, selected = merge_clip_records(configs, {"a.mov", "c.mov"}, fresh)
+
+    assert list(clip_configs) == ["b.mov", "a_renamed.mov", "d.mov"]
+    assert clip_uids == {"uid-2": "b.mov", "uid-1": "a_renamed.mov", "uid-4": "d.mov"}
+    assert selected == {"a_renamed.mov"}
+    assert (clip_configs["a_renamed.mov"]['range_start'], clip_configs["a_renamed.mov"]['range_end']) == (10.0, 50.0)
+    # The custom range no longer fits the shorter clip, so it falls back to the full clip
+    assert (clip_configs["b.mov"]['range_start'], clip_configs["b.mov"]['range_end']) == (0.0, 30.0)
+    assert clip_configs["d.mov"]['clip'] is None
+
+
+def test_full_range_follows_a_new_duration():
+    configs = {"a.mov": make_clip_config(record("uid-1", "a.mov", 60.0))}
+    clip_configs, _, _ = merge_clip_records(configs, set(), [record("uid-1", "a.mov", 90.0)])
+    assert (clip_configs["a.mov"]['range_start'], clip_configs["a.mov"]['range_end']) == (0.0, 90.0)
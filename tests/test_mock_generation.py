@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+from Broller import GenerationError, SlicePlacer
+from mock_resolve import MockEnv, build_project, check_invariants, run_generation
+
+
+def run(pool_size=200, failures=None, still_ratio=0.1, seed=1, clip_seconds=(5, 300), **kwargs):
+    random.seed(seed)
+    env = MockEnv(failures=failures, seed=seed)
+    app = build_project(pool_size, env, still_ratio=still_ratio, seed=seed, clip_seconds=clip_seconds)
+    return env, run_generation(app, **kwargs)
+
+
+@pytest.mark.parametrize("prevent_duplicates", [True, False])
+@pytest.mark.parametrize("pacing", ["Uniform", "Log-normal", "Slow Down"])
+def test_fill_is_exact_with_no_overlaps(prevent_duplicates, pacing):
+    _, result = run(prevent_duplicates=prevent_duplicates, pacing=pacing)
+    assert result['stop_reason'] == "complete"
+    assert result['filled'] == result['frames_to_fill']
+    assert check_invariants(result, prevent_duplicates) == []
+
+
+def test_dedupe_holds_with_a_small_pool():
+    _, result = run(pool_size=3, still_ratio=0.0, prevent_duplicates=True, min_sec=20, max_sec=40)
+    assert result['stop_reason'] in ("complete", "exhausted")
+    assert not [problem for problem in check_invariants(result, True) if "duplicate" in problem]
+
+
+@pytest.mark.parametrize("prevent_duplicates", [True, False])
+@pytest.mark.parametrize("clip_seconds", [(3, 3), (2.2, 4.5)])
+@pytest.mark.parametrize("seed", range(4))
+def test_clips_shorter_than_max_never_leave_a_sliver(prevent_duplicates, clip_seconds, seed):
+    # 30 clips are enough to fill without dedupe, dedupe needs more source material
+    _, result = run(pool_size=300 if prevent_duplicates else 30, still_ratio=0.0, seed=seed,
+                    clip_seconds=clip_seconds, prevent_duplicates=prevent_duplicates, min_sec=2.0, max_sec=5.0)
+    assert check_invariants(result, prevent_duplicates) == []
+    lengths = [item.end - item.start for item in result['timeline'].tracks[result['track']]]
+    assert min(lengths) >= int(2.0 * 24)
+    assert max(lengths) <= int(clip_seconds[1] * 24)
+
+
+def test_append_failures_stop_after_the_limit():
+    env, result = run(failures={"AppendToTimeline": 1.0})
+    assert env.calls["AppendToTimeline"] == SlicePlacer.MAX_CONSECUTIVE_FAILURES
+    assert result['clips_added'] == 0
+    assert result['stop_reason'] == "failures"
+    assert check_invariants(result, True) != []  # An early stop is a violation unless allowed
+    assert check_invariants(result, True, allow_early_stop=True) == []
+
+
+def test_failed_still_resize_deletes_the_item():
+    env, result = run(failures={"Resize": 1.0}, still_ratio=1.0)
+    assert env.calls["DeleteClips"] == SlicePlacer.MAX_CONSECUTIVE_FAILURES
+    assert result['timeline'].tracks[result['track']] == []
+    assert result['stop_reason'] == "failures"
+
+
+def test_failed_delete_stops_with_the_track_in_sync():
+    env, result = run(failures={"Resize": 1.0, "DeleteClips": 1.0}, still_ratio=1.0)
+    assert env.calls["DeleteClips"] == 1
+    assert result['stop_reason'] == "delete_failed"
+    assert result['clips_added'] == 1
+    assert check_invariants(result, True, allow_early_stop=True) == []
+
+
+@pytest.mark.parametrize("pool_size", [100, 1000, 5000])
+def test_throughput_per_pool_size(pool_size, record_property):
+    _, result = run(pool_size=pool_size)
+    assert check_invariants(result, True) == []
+    rate = result['clips_added'] / result['place_sec'] if result['place_sec'] else float('inf')
+    record_property("pool_size", pool_size)
+    record_property("slices_per_sec", round(rate))
+    record_property("place_calls", result['place_calls'])
+    # Placement cost depends on the number of slices, not on the size of the pool
+    assert result['place_calls'] <= 3 * result['clips_added'] + 20
+
+
+def test_latency_is_injected_per_call():
+    random.seed(1)
+    env = MockEnv(latency={"*": (0.0002, 0.0)}, seed=1)
+    result = run_generation(build_project(20, env, seed=1), min_sec=20.0, max_sec=40.0)
+    assert check_invariants(result, True) == []
+    assert result['scan_sec'] >= result['scan_calls'] * 0.0002
+    assert result['place_sec'] >= result['place_calls'] * 0.0002
+
+
+def test_second_run_reuses_the_timeline_index():
+    random.seed(1)
+    env = MockEnv(seed=1)
+    app = build_project(200, env, seed=1)
+    first = run_generation(app)
+    index = first['timeline_index']
+
+    env.calls.clear()
+    second = run_generation(app, track=f"Track {first['track']}", total_sec=30, timeline_index=index)
+    assert second['timeline_index'] is index
+    assert second['start'] == first['start'] + first['filled']
+    assert second['filled'] == 30 * 24
+    assert check_invariants(second, True) == []
+    # The destination track is re-checked with one item list and one GetEnd, no full fetch
+    assert env.calls["GetItemListInTrack"] == 1
+    assert env.calls["GetEnd"] == 1
+    assert "GetStart" not in env.calls
+
+
+@pytest.mark.parametrize("kwargs, level", [
+    ({'min_sec': 0.0}, "error"),
+    ({'min_sec': 5.0, 'max_sec': 2.0}, "error"),
+    ({'total_sec': 0}, "error"),
+    ({'heavy_limit': ("x", 10)}, "error"),
+])
+def test_invalid_settings_are_rejected_before_touching_the_timeline(kwargs, level):
+    env = MockEnv()
+    with pytest.raises(GenerationError) as error:
+        run_generation(build_project(10, env), **kwargs)
+    assert error.value.level == level
+    assert "AddTrack" not in env.calls
+
+
+def test_invalid_track_selection_is_rejected():
+    with pytest.raises(GenerationError):
+        run_generation(build_project(10), track="Track x")
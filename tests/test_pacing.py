@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from Broller import PACING_MODES, PacingEngine
+
+
+@pytest.mark.parametrize("mode", PACING_MODES)
+@pytest.mark.parametrize("total", [48, 49, 500, 1234, 14400])
+def test_plan_fills_exactly_within_bounds(mode, total):
+    random.seed(total)
+    pacer = PacingEngine(mode, 48, 120)
+    for _ in range(20):
+        lengths = pacer.plan(total)
+        assert sum(lengths) == total
+        assert all(48 <= length <= 120 for length in lengths)
+
+
+@pytest.mark.parametrize("min_f, max_f, total", [(48, 120, 30), (100, 120, 130), (100, 120, 250), (5, 5, 12)])
+def test_infeasible_total_runs_long_instead_of_ending_short(min_f, max_f, total):
+    random.seed(0)
+    lengths = PacingEngine("Uniform", min_f, max_f).plan(total)
+    assert sum(lengths) == total
+    if total >= min_f:
+        assert all(length >= min_f for length in lengths)
+
+
+@pytest.mark.parametrize("min_f, max_f", [(0, 0), (48, 0), (0, 48), (120, 48), (-24, 48)])
+def test_invalid_bounds_are_rejected(min_f, max_f):
+    with pytest.raises(ValueError):
+        PacingEngine("Uniform", min_f, max_f)
+
+
+def test_unknown_mode_falls_back_to_uniform():
+    assert PacingEngine("Unknown", 24, 48).mode == "Uniform"
+
+
+def test_fit_shorter_leaves_a_fillable_tail():
+    pacer = PacingEngine("Uniform", 48, 120)
+    assert pacer.fit_shorter(72, 1000) == 72
+    assert pacer.fit_shorter(72, 100) == 52  # 100 - 72 = 28 could not be filled
+    assert pacer.fit_shorter(50, 60) is None  # Any in-bounds slice leaves a sliver
+    assert pacer.fit_shorter(30, 1000) == 30  # Clip shorter than min: all of it
+
+
+def quarter_means(lengths):
+    quarter = len(lengths) // 4
+    return sum(lengths[:quarter]) / quarter, sum(lengths[-quarter:]) / quarter
+
+
+def test_speed_up_and_slow_down_follow_the_curve():
+    random.seed(1)
+    first, last = quarter_means(PacingEngine("Speed Up", 24, 240).plan(24 * 600))
+    assert first > last + 60
+    first, last = quarter_means(PacingEngine("Slow Down", 24, 240).plan(24 * 600))
+    assert last > first + 60
+
+
+def test_replan_continues_the_curve():
+    random.seed(2)
+    pacer = PacingEngine("Speed Up", 24, 240)
+    tail = pacer.plan(24 * 100, done=24 * 500, overall=24 * 600)
+    assert sum(tail) == 24 * 100
+    assert sum(tail) / len(tail) < 24 + (240 - 24) * 0.3
@@ -0,0 +1,61 @@
+import os
+
+import Broller
+from Broller import PresetStore, clip_keys, fit_clip_range
+
+
+def test_preset_store_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(Broller, "DATA_DIR", str(tmp_path))
+    store = PresetStore("My Project: v2")
+    preset = {'selected': ["uid-1"], 'ranges': {"uid-1": [1.0, 4.5]}, 'settings': {'min': "2"}}
+    store.save("Day 2", preset)
+    store.save("Day 3", {})
+
+    reloaded = PresetStore("My Project: v2").load()
+    assert reloaded.names() == ["Day 2", "Day 3"]
+    assert reloaded.get("Day 2") == preset
+
+    reloaded.delete("Day 3")
+    assert PresetStore("My Project: v2").load().names() == ["Day 2"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_preset_store_ignores_corrupt_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(Broller, "DATA_DIR", str(tmp_path))
+    store = PresetStore("proj")
+    os.makedirs(os.path.dirname(store.path))
+    with open(store.path, "w") as f:
+        f.write("{not json")
+    assert store.load().names() == []
+
+
+def test_fit_clip_range():
+    assert fit_clip_range(1.0, 4.0, 10.0) == (1.0, 4.0)
+    assert fit_clip_range(-2.0, 12.0, 10.0) == (0.0, 10.0)
+    assert fit_clip_range(6.0, 3.0, 10.0) == (0.0, 10.0)
+    assert fit_clip_range(11.0, 15.0, 10.0) == (0.0, 10.0)
+
+
+def test_clip_keys_disambiguate_duplicate_names():
+    records = [
+        {'name': "A001.mov", 'bin': "Master/Day 1"},
+        {'name': "A001.mov", 'bin': "Master/Day 2"},
+        {'name': "B001.mov", 'bin': "Master/Day 1"},
+        {'name': "A001.mov", 'bin': "Master/Day 2"},
+    ]
+    assert clip_keys(records) == [
+        "A001.mov [Master/Day 1]",
+        "A001.mov [Master/Day 2]",
+        "B001.mov",
+        "A001.mov [Master/Day 2] #2",
+    ]
+
+
+def test_presets_and_scan_cache_never_share_a_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(Broller, "DATA_DIR", str(tmp_path))
+    Broller.ScanCache("Foo").save([])
+    store = PresetStore("Foo.scan")
+    store.save("Day 2", {})
+    assert Broller.ScanCache("Foo").path != store.path
+    assert PresetStore("Foo.scan").load().names() == ["Day 2"]
+    assert PresetStore("Foo").load().names() == []
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from Broller import RenderCostPolicy, codec_class, is_heavy_media, render_cost
+
+
+@pytest.mark.parametrize("codec, expected", [
+    ("Apple ProRes 422 HQ", "intra"),
+    ("DNxHR HQX", "intra"),
+    ("AVC-Intra 100", "intra"),
+    ("XAVC Intra", "intra"),
+    ("H.264 All-I", "intra"),
+    ("H.264", "avc"),
+    ("AVC", "avc"),
+    ("H.265", "hevc"),
+    ("HEVC", "hevc"),
+    ("Blackmagic RAW", "raw"),
+    ("Apple ProRes RAW", "raw"),
+    ("RED R3D", "raw"),
+])
+def test_codec_class(codec, expected):
+    assert codec_class(codec) == expected
+
+
+def test_render_cost():
+    assert render_cost("Apple ProRes 422", 1920, 1080, False, False) == 1.0
+    assert render_cost("AVC-Intra 100", 1920, 1080, False, False) == 1.0
+    assert render_cost("H.264", 3840, 2160, False, False) == 6.0
+    assert render_cost("H.265", 3840, 2160, False, True) == 0.5
+    assert render_cost("", 0, 0, True, False) == 0.1
+
+
+@pytest.mark.parametrize("codec, width, height, has_proxy, heavy", [
+    ("H.265", 1920, 1080, False, True),
+    ("Blackmagic RAW", 1920, 1080, False, True),
+    ("H.264", 1920, 1080, False, False),
+    ("H.264", 3840, 2160, False, True),
+    ("Apple ProRes 422", 3840, 2160, False, False),
+    ("Apple ProRes 422", 7680, 4320, False, True),
+    ("Blackmagic RAW", 7680, 4320, True, False),
+])
+def test_heavy_by_codec_class_and_cost(codec, width, height, has_proxy, heavy):
+    cost = render_cost(codec, width, height, False, has_proxy)
+    assert is_heavy_media(codec, cost, False, has_proxy) is heavy
+
+
+def config(cost, heavy=False, is_still=False):
+    return {'cost': cost, 'heavy': heavy, 'is_still': is_still}
+
+
+def test_weights_prefer_proxies():
+    policy = RenderCostPolicy({"proxy": config(0.5), "prores": config(1.0), "h264": config(1.5),
+                               "still": config(0.1, is_still=True)}, 1, 240)
+    assert policy.weight("proxy") == 2.0
+    assert policy.weight("prores") == 1.0
+    assert policy.weight("h264") < 1.0
+    assert policy.weight("still") == 1.0
+
+
+def test_heavy_slices_are_capped_per_window():
+    random.seed(3)
+    configs = {"heavy_a": config(2.5, heavy=True), "heavy_b": config(3.0, heavy=True), "light": config(1.0)}
+    policy = RenderCostPolicy(configs, 1, 100)
+    pool = list(configs)
+    heavy_starts = []
+    for pos in range(0, 5000, 20):
+        name = policy.choose(pool, pos)
+        policy.placed(name, pos)
+        if configs[name]['heavy']:
+            heavy_starts.append(pos)
+    assert heavy_starts
+    assert all(b - a >= 100 for a, b in zip(heavy_starts, heavy_starts[1:]))
+
+
+def test_only_heavy_clips_left_are_still_chosen():
+    policy = RenderCostPolicy({"heavy": config(3.0, heavy=True)}, 0, 100)
+    assert policy.choose(["heavy"], 0) == "heavy"
+
+
+def test_removed_clip_is_never_chosen():
+    random.seed(4)
+    configs = {name: config(1.0) for name in "abcd"}
+    policy = RenderCostPolicy(configs, 1, 100)
+    pool = list(configs)
+    policy.choose(pool, 0)
+    pool.remove("a")
+    policy.remove("a")
+    assert "a" not in {policy.choose(pool, pos) for pos in range(200)}
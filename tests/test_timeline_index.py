@@ -0,0 +1,109 @@
+from Broller import TimelineIndex
+from mock_resolve import MockClip, MockEnv, MockTimeline
+
+
+def make_timeline(spans, start_frame=1000):
+    env = MockEnv()
+    timeline = MockTimeline(env, start_frame=start_frame, video_tracks=2)
+    clip = MockClip(env, "uid-0", "clip", {"Type": "Video"})
+    for start, end in spans:
+        timeline.append({"mediaPoolItem": clip, "trackIndex": 1, "recordFrame": start,
+                         "startFrame": 0, "endFrame": end - start})
+    return env, timeline
+
+
+def test_track_end_fetches_only_the_last_item():
+    env, timeline = make_timeline([(1000, 1100), (1100, 1300), (1400, 1500)])
+    index = TimelineIndex(timeline)
+    assert index.track_end(1) == 1500
+    assert index.track_end(2) == 1000  # Empty track
+    assert index.track_end(1) == 1500
+    assert env.calls.get("GetEnd") == 1
+    assert "GetStart" not in env.calls
+    assert env.calls["GetItemListInTrack"] == 2
+
+
+def test_is_free_and_add():
+    env, timeline = make_timeline([(1000, 1100), (1200, 1300)])
+    index = TimelineIndex(timeline)
+    assert index.is_free(1, 1300, 1400)
+    assert "GetStart" not in env.calls  # Past the last item, no spans needed
+    assert index.is_free(1, 1100, 1200)
+    assert not index.is_free(1, 1050, 1150)
+    assert not index.is_free(1, 1150, 1250)
+    assert not index.is_free(1, 900, 1300)
+
+    index.add(1, 1100, 1200)
+    assert not index.is_free(1, 1150, 1160)
+    index.add(1, 1300, 1350)
+    assert index.track_end(1) == 1350
+    assert index.is_free(1, 1350, 1400)
+
+
+def test_index_is_reused_across_runs():
+    env, timeline = make_timeline([(1000, 1100)])
+    index = TimelineIndex(timeline)
+    index.add_empty_track(3)
+    assert index.track_end(3) == 1000
+    assert "GetItemListInTrack" not in env.calls
+
+    assert index.track_end(1) == 1100
+    item = timeline.append({"mediaPoolItem": None, "trackIndex": 1, "recordFrame": 1100,
+                            "startFrame": 0, "endFrame": 50})
+    index.add(1, 1100, 1150)
+
+    # Our own inserts keep the summary in sync, so the next run keeps it
+    index.begin_run(timeline)
+    track = index.tracks[1]
+    assert index.track_end(1) == 1150
+    assert index.tracks[1] is track
+
+    # An edit made between runs is picked up
+    timeline.DeleteClips([item])
+    index.begin_run(timeline)
+    assert index.track_end(1) == 1100
+    assert index.tracks[1] is not track
+
+
+def test_track_end_relies_on_timeline_order():
+    # Items added out of order are still listed by start, as in Resolve
+    env, timeline = make_timeline([(1400, 1500), (1000, 1100), (1100, 1300)])
+    assert [item.start for item in timeline.GetItemListInTrack("video", 1)] == [1000, 1100, 1400]
+    assert TimelineIndex(timeline).track_end(1) == 1500
+
+
+def test_full_fetch_corrects_the_summary():
+    env, timeline = make_timeline([(1000, 1100), (1200, 1300)])
+    index = TimelineIndex(timeline)
+    index.tracks[1] = {'count': 2, 'end': 1250, 'starts': None, 'ends': None}  # As if read out of order
+    index.checked.add(1)
+    assert not index.is_free(1, 1200, 1210)
+    assert index.track_end(1) == 1300
+
+
+def test_edit_keeping_count_and_end_is_seen_next_run():
+    env, timeline = make_timeline([(1000, 1100), (1200, 1300), (1400, 1500)])
+    index = TimelineIndex(timeline)
+    assert index.gaps(1, 1000, 1500) == [(1100, 1200), (1300, 1400)]
+
+    timeline.tracks[1][1].start, timeline.tracks[1][1].end = 1100, 1200  # Move the middle item
+    index.begin_run(timeline)
+    assert index.gaps(1, 1000, 1500) == [(1200, 1400)]
+    assert not index.is_free(1, 1150, 1160)
+
+
+def test_gaps():
+    env, timeline = make_timeline([(1000, 1100), (1200, 1300), (1300, 1350), (1500, 1600)])
+    index = TimelineIndex(timeline)
+    assert index.gaps(1, 900, 1700) == [(900, 1000), (1100, 1200), (1350, 1500), (1600, 1700)]
+    assert index.gaps(1, 1000, 1600) == [(1100, 1200), (1350, 1500)]
+    assert index.gaps(1, 1050, 1250) == [(1100, 1200)]  # Bounds inside items
+    assert index.gaps(1, 1100, 1200) == [(1100, 1200)]  # Exactly one gap
+    assert index.gaps(1, 1200, 1350) == []  # Back-to-back items
+    assert index.gaps(1, 1220, 1230) == []  # Inside one item
+    assert index.gaps(1, 1300, 1300) == []  # Empty range
+    assert index.gaps(1, 1600, 1700) == [(1600, 1700)]  # After the last item
+    assert index.gaps(2, 1000, 1100) == [(1000, 1100)]  # Empty track
+
+    index.add(1, 1100, 1200)
+    assert index.gaps(1, 1000, 1400) == [(1350, 1400)]